@@ -0,0 +1,66 @@
+"""
+Benchmark of the BDF writer of `AnalysisModel.export_to_bdf`, which writes the mesh cards from
+the `PlateMesh` arrays, against `BDF.write_bdf` of the model with the GRID and CQUAD4 objects, on
+a panel model with about 100k CQUAD4 elements.
+
+Run from the project root:
+    python benchmarks/bdf_writer.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+import numpy as np
+
+from nastran.structures.material import OrthotropicMaterial
+from nastran.structures.panel import LaminatedStructuralPlate
+from pyNastran.bdf.bdf import BDF
+
+from nastran.bdf_writer import write_bdf
+
+NSPAN = NCHORD = 316  # 99856 elements
+REPEAT = 3
+
+
+def create_model():
+    p1 = np.array([0., 0., 0.])
+    p2 = p1 + np.array([300., 0., 0.])
+    p3 = p1 + np.array([300., 200., 0.])
+    p4 = p1 + np.array([0., 200., 0.])
+    cfrp = OrthotropicMaterial(1, 54000., 18000., 0.3, 7200., 2.6e-9, 0.011e-6, 12.47e-6)
+    plate = LaminatedStructuralPlate.create_sawyer_plate(p1, p2, p3, p4, NSPAN, NCHORD, 1, 45, 6, 0.2, cfrp)
+    return plate
+
+
+def best_time(func):
+    times = []
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == '__main__':
+    plate = create_model()
+    model = plate.bdf
+    with tempfile.TemporaryDirectory() as folder:
+        a = os.path.join(folder, 'write_bdf.bdf')
+        b = os.path.join(folder, 'fast.bdf')
+        t_bdf = best_time(lambda: model.write_bdf(a, enddata=True))
+        t_fast = best_time(lambda: write_bdf(plate.to_bdf(mesh_cards=False), b, meshes=[plate.mesh], enddata=True))
+
+        # same cards, the mesh cards are only written in another place
+        decks = []
+        for filename in (a, b):
+            deck = BDF(debug=False)
+            deck.read_bdf(filename, xref=False)
+            decks.append(deck)
+        assert decks[0].get_bdf_stats() == decks[1].get_bdf_stats()
+
+    print('{} nodes, {} elements'.format(len(model.nodes), len(model.elements)))
+    print('{:<16} {:8.3f} s'.format('BDF.write_bdf', t_bdf))
+    print('{:<16} {:8.3f} s'.format('write_bdf', t_fast))
@@ -0,0 +1,76 @@
+"""
+Benchmark of the per page overhead of the page classification and of the header decoding.
+
+Run from the project root:
+    python benchmarks/f06_page_header.py
+"""
+import os
+import sys
+import time
+import timeit
+import calendar
+import datetime
+
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from nastran.post.f06.f06 import _group_lines_by_page
+from nastran.post.f06.common import re_date, re_version, re_page, decode_page_header
+from nastran.post.f06.pagetype import (
+    _check_page_type, FLUTTER_CHECK_LINE, FLUTTER_CHECK_STR, EIGVALSUMMARY_CHECK_LINE,
+    EIGVALSUMMARY_CHECK_STR, REALEIGVAL_CHECK_LINE, REALEIGVAL_CHECK_STR)
+from nastran.post.f06.eigval import ModalEffectiveMassFractionF06Page
+
+F06_FILE = 'tests/files/flutter-f06-result.txt'
+REPEAT = 5
+NUMBER = 50
+
+
+def check_page_type_sequential(lines, previous_page_type=None):
+    if len(lines)-1 >= FLUTTER_CHECK_LINE and FLUTTER_CHECK_STR in lines[FLUTTER_CHECK_LINE]:
+        return 'flutter'
+    elif len(lines)-1 >= EIGVALSUMMARY_CHECK_LINE and EIGVALSUMMARY_CHECK_STR in lines[EIGVALSUMMARY_CHECK_LINE]:
+        return 'text'
+    elif len(lines)-1 >= REALEIGVAL_CHECK_LINE and REALEIGVAL_CHECK_STR in lines[REALEIGVAL_CHECK_LINE]:
+        return 'realeigval'
+    elif ModalEffectiveMassFractionF06Page.is_page_of_this_type(lines, previous_page_type):
+        return 'ModalEffectiveMassFractionF06Page'
+    return 'text'
+
+
+def decode_header_regexes(line):
+    date = re_date.search(line)
+    version = re_version.search(line)
+    page = re_page.search(line)
+    return {
+        'run-date': datetime.date(
+            int(date.group('year').strip()),
+            list(calendar.month_name).index(date.group('month').strip().title()),
+            int(date.group('day').strip())),
+        'run-version-name': version.group('vname').strip(),
+        'run-version-date': datetime.date(*time.strptime(version.group('vdate').strip(), '%m/%d/%y')[:3]),
+        'page': int(page.group('page')),
+    }
+
+
+def run(classify, decode, pages):
+    T = None
+    for lines in pages:
+        T = classify(lines, T)
+        decode(lines[0])
+
+
+if __name__ == '__main__':
+    with open(F06_FILE, 'r') as file:
+        pages = [lines for lines in _group_lines_by_page(file) if re_page.search(lines[0])]
+
+    T1 = T2 = None
+    for lines in pages:
+        T1, T2 = check_page_type_sequential(lines, T1), _check_page_type(lines, T2)
+        assert T1 == T2
+        assert decode_header_regexes(lines[0]) == decode_page_header(lines[0])
+
+    print('{} pages'.format(len(pages)))
+    for name, classify, decode in (('sequential + regexes', check_page_type_sequential, decode_header_regexes),
+                                   ('registry + memoized', _check_page_type, decode_page_header)):
+        t = min(timeit.repeat(lambda: run(classify, decode, pages), repeat=REPEAT, number=NUMBER)) / NUMBER
+        print('{:<24} {:8.2f} us/page'.format(name, t*1e6/len(pages)))
@@ -0,0 +1,52 @@
+"""
+Benchmark of the tabular data extraction of the F06 flutter summary pages.
+
+Run from the project root:
+    python benchmarks/f06_tabulated_data.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from nastran.post.f06 import read_f06
+from nastran.post.f06.common import extract_tabulated_data, extract_tabulated_array, find_tabular_line_range
+from nastran.post.f06.flutter import FLUTTER_SUMMARY_TABULAR_LINE, FLUTTER_DATA_KEYS
+
+import numpy as np
+import pandas as pd
+
+F06_FILE = 'tests/files/flutter-f06-result.txt'
+REPEAT = 5
+NUMBER = 20
+
+
+def _tables(filename):
+    tables = []
+    for page in read_f06(filename).flutter:
+        a, b = find_tabular_line_range(page.raw_lines, FLUTTER_SUMMARY_TABULAR_LINE)
+        tables.append(page.raw_lines[a:b])
+    return tables
+
+
+def parse_with_lists(tables):
+    return [pd.DataFrame(extract_tabulated_data(t), columns=list(FLUTTER_DATA_KEYS)) for t in tables]
+
+
+def parse_with_array(tables):
+    return [pd.DataFrame(extract_tabulated_array(t, len(FLUTTER_DATA_KEYS)), columns=list(FLUTTER_DATA_KEYS))
+            for t in tables]
+
+
+if __name__ == '__main__':
+    tables = _tables(F06_FILE)
+    nlines = sum(map(len, tables))
+
+    for a, b in zip(parse_with_lists(tables), parse_with_array(tables)):
+        assert np.array_equal(a.to_numpy(), b.to_numpy(), equal_nan=True)
+
+    print('{} flutter pages, {} table lines'.format(len(tables), nlines))
+    for func in (parse_with_lists, parse_with_array):
+        t = min(timeit.repeat(lambda: func(tables), repeat=REPEAT, number=NUMBER)) / NUMBER
+        print('{:<20} {:8.3f} ms/file  {:8.2f} us/line'.format(func.__name__, t*1e3, t*1e6/nlines))
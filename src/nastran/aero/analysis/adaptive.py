@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from nastran.post.f06.flutter import find_damping_crossings, get_critical_roots
+
+# velocities of each refined bracket (its limits included)
+REFINE_POINTS = 6
+
+
+def refine_flutter_onset(solve, velocities, vref=1., rtol=1e-4, points=REFINE_POINTS, max_iter=20, epsilon=1e-9):
+    """
+    Critical roots (see `get_critical_roots`) refined by velocity bisection around the flutter
+    onset, instead of solving a dense uniform velocity list.
+
+    `solve(velocities)` returns the flutter results of the velocities (model units, as in the
+    FLFACT card of the global case) in the `flutter_pages_to_df` layout, e.g. a call to
+    `PistonPanelFlutterSolver.solve` or a SOL 145 run of a deck with these velocities read
+    back from its F06. Its VELOCITY column is the velocity divided by `vref`.
+
+    The coarse `velocities` bracket the onset of each subcase and Mach number (and any other
+    group) between two consecutive velocities. Each pass solves `points` velocities inside
+    the brackets not yet converged and brackets the onset again, until the bracket is narrower
+    than `rtol` times the onset velocity.
+
+    The number of solved velocities and of passes are kept in `roots.attrs['evaluations']` and
+    `roots.attrs['iterations']`.
+    """
+    velocities = np.unique(np.asarray(velocities, dtype=np.float64))
+    roots = get_critical_roots(solve(velocities), epsilon)
+    evaluations = len(velocities)
+    iterations = 0
+    if len(roots) == 0:
+        return roots
+
+    # each root is replaced by its refined crossing row (its POINT is the one of the refined solve)
+    rows = [roots.iloc[[i]] for i in range(len(roots))]
+    onsets = roots['VELOCITY'].to_numpy()*vref
+    groups = {group: i for i, group in enumerate(roots.index.droplevel('POINT'))}
+    lower, upper = onset_brackets(onsets, velocities)
+
+    while iterations < max_iter:
+        active = np.flatnonzero(upper - lower > rtol*onsets)
+        if len(active) == 0:
+            break
+        iterations += 1
+
+        refined = bracket_velocities(lower[active], upper[active], points)
+        crossings = find_damping_crossings(solve(refined), epsilon, direction=1)
+        evaluations += len(refined)
+
+        crossing_roots = np.array([groups.get(g, -1) for g in crossings.index.droplevel(['POINT', 'CROSSING'])])
+        crossing_velocities = crossings['VELOCITY'].to_numpy()*vref
+        for i in active:
+            inside = (crossing_roots == i) & (crossing_velocities >= lower[i]) & (crossing_velocities <= upper[i])
+            if not inside.any():
+                print("WARNING: Lost the flutter onset of {} inside [{}, {}]".format(rows[i].index[0], lower[i], upper[i]))
+                lower[i] = upper[i] = onsets[i]
+                continue
+            j = np.flatnonzero(inside)[np.argmin(crossing_velocities[inside])]
+            rows[i] = crossings.iloc[[j]].droplevel('CROSSING')
+            onsets[i] = crossing_velocities[j]
+            (lower[i],), (upper[i],) = onset_brackets(crossing_velocities[j:j+1], refined)
+
+    roots = pd.concat(rows)
+    roots.attrs['evaluations'] = evaluations
+    roots.attrs['iterations'] = iterations
+    return roots
+
+
+def onset_brackets(onsets, velocities):
+    """
+    Consecutive velocities (lower, upper) bracketing each onset velocity.
+    """
+    velocities = np.asarray(velocities, dtype=np.float64)
+    upper = np.clip(np.searchsorted(velocities, onsets, side='right'), 1, len(velocities) - 1)
+    return velocities[upper - 1], velocities[upper]
+
+
+def bracket_velocities(lower, upper, points=REFINE_POINTS):
+    """
+    Sorted union of `points` evenly spaced velocities of each bracket (e.g. the velocities of the
+    FLFACT card of a refined SOL 145 run).
+    """
+    return np.unique(np.linspace(lower, upper, points).ravel())
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+from nastran.post.f06.flutter import FLUTTER_DATA_KEYS, FLUTTER_INDEX_KEYS
+
+# points solved per batched eigenvalue call (bounds the memory of the state space matrices)
+EIGEN_CHUNK_SIZE = 4096
+
+
+class FlutterGrid:
+    """
+    The (density ratio, Mach number, velocity) points of a flutter analysis, as the FLFACT
+    cards of a `FlutterAnalysisModel` global case define them. The air density is `ref_rho`
+    times the density ratio.
+    """
+
+    def __init__(self, machs, velocities, densities_ratio=(1.,), ref_rho=1.):
+        self.machs = np.atleast_1d(np.asarray(machs, dtype=np.float64))
+        self.velocities = np.atleast_1d(np.asarray(velocities, dtype=np.float64))
+        self.densities_ratio = np.atleast_1d(np.asarray(densities_ratio, dtype=np.float64))
+        self.ref_rho = ref_rho
+
+    def __repr__(self):
+        return 'Flutter Grid of {} density ratios, {} Mach numbers and {} velocities.'.format(*self.shape)
+
+    @property
+    def shape(self):
+        return len(self.densities_ratio), len(self.machs), len(self.velocities)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def points(self):
+        """
+        Air density, Mach number and velocity of every point (flattened in the order of `shape`).
+        """
+        rho, mach, velocity = np.meshgrid(self.ref_rho*self.densities_ratio, self.machs, self.velocities, indexing='ij')
+        return rho.ravel(), mach.ravel(), velocity.ravel()
+
+    @classmethod
+    def from_global_case(cls, global_case):
+        return cls(global_case.machs, global_case.velocities, global_case.densities_ratio, global_case.ref_rho)
+
+
+def solve_flutter_grid(system_matrices, grid: FlutterGrid, n_modes, track_modes=True, chunk_size=EIGEN_CHUNK_SIZE):
+    """
+    Flutter roots (shape of the grid + (n_modes,)) of a modal system M q'' + C q' + K q = 0
+    with identity modal mass, where `system_matrices(mach, rho, velocity)` returns the stacked
+    (npoints, n_modes, n_modes) K and C matrices of the given points. A C proportional to the
+    identity may be given as the (npoints,) array of its coefficients, which halves the order
+    of the eigenvalue problems.
+
+    The state space matrices of `chunk_size` points at a time are solved in a single batched
+    call. At the first velocity the roots are sorted by frequency; with `track_modes` each root
+    of the next velocities keeps the position of the root of the previous velocity with the most
+    correlated eigenvector (greatest MAC), so the POINT of a mode is kept through frequency
+    crossings and coalescences. Otherwise the roots of every point are sorted by frequency.
+    """
+    rho, mach, velocity = grid.points()
+    nv = grid.shape[-1]
+    size = grid.size
+
+    roots = np.empty((size, n_modes), dtype=np.complex128)
+    links = np.empty((size, n_modes), dtype=np.int64)
+    previous = None
+    for a in range(0, size, chunk_size):
+        b = min(a + chunk_size, size)
+        K, C = system_matrices(mach[a:b], rho[a:b], velocity[a:b])
+        roots[a:b], vectors = _solve_state_space(K, C, n_modes, track_modes)
+        if not track_modes:
+            continue
+
+        # each point is linked to the previous velocity of its line (from the last chunk for the first one)
+        before = np.concatenate([vectors[:1] if previous is None else previous, vectors[:-1]])
+        links[a:b] = match_modes(before, vectors)
+        previous = vectors[-1:]
+
+    roots = roots.reshape(-1, nv, n_modes)
+    if track_modes:
+        links = links.reshape(-1, nv, n_modes)
+        order = np.empty_like(links)
+        order[:, 0] = np.arange(n_modes)
+        for j in range(1, nv):
+            order[:, j] = np.take_along_axis(links[:, j], order[:, j-1], axis=1)
+        roots = np.take_along_axis(roots, order, axis=2)
+
+    return roots.reshape(grid.shape + (n_modes,))
+
+
+def match_modes(before, after):
+    """
+    For each pair of (npoints, n, m) stacked mode shapes (m modes of n dofs), the index of the
+    mode of `after` matching each mode of `before`, greedily by the greatest MAC.
+    """
+    mac = modal_assurance_criterion(before, after)
+    npoints, m, _ = mac.shape
+    rows = np.arange(npoints)
+    match = np.empty((npoints, m), dtype=np.int64)
+    for _ in range(m):
+        i, j = np.divmod(mac.reshape(npoints, -1).argmax(axis=1), m)
+        match[rows, i] = j
+        mac[rows, i, :] = -1.
+        mac[rows, :, j] = -1.
+    return match
+
+
+def modal_assurance_criterion(a, b):
+    """
+    MAC (npoints, m, m) between the columns of the stacked (npoints, n, m) complex mode shapes.
+    """
+    cross = np.abs(a.conj().transpose(0, 2, 1) @ b)**2
+    na = (a.real**2 + a.imag**2).sum(axis=1)
+    nb = (b.real**2 + b.imag**2).sum(axis=1)
+    return cross / (na[:, :, None] * nb[:, None, :])
+
+
+def flutter_data(roots, velocity, semi_chord, vref=1.):
+    """
+    Rows (..., 7) of the flutter summary columns (KFREQ, 1./KFREQ, VELOCITY, DAMPING, FREQUENCY,
+    REALEIGVAL, IMAGEIGVAL) of the roots p = omega (g/2 + i) as in the PK method.
+    The damping of a non-oscillatory root is its decay rate (p b / (V ln 2)).
+    """
+    re, im = roots.real, roots.imag
+    velocity = np.broadcast_to(velocity, roots.shape)
+    oscillatory = im > 1e-9*np.abs(roots).max(initial=1.)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kfreq = np.where(oscillatory, im * semi_chord / velocity, 0.)
+        damping = np.where(oscillatory, 2*re / im, re * semi_chord / (velocity * np.log(2)))
+        inverse = np.where(oscillatory, 1 / kfreq, np.inf)
+    return np.stack([kfreq, inverse, velocity / vref, damping, im / (2*np.pi), re, im], axis=-1)
+
+
+def flutter_roots_to_df(roots, grid: FlutterGrid, semi_chord, vref=1., subcase=1):
+    """
+    DataFrame of the roots of `solve_flutter_grid` in the `flutter_pages_to_df` layout (one POINT
+    per mode), with an outer DENSITY RATIO index level if there is more than one density ratio.
+    """
+    nd, nm, nv = grid.shape
+    n_modes = roots.shape[-1]
+    data = flutter_data(roots, grid.velocities[:, None], semi_chord, vref)
+    # rows ordered by density ratio, Mach number, mode and velocity
+    data = data.transpose(0, 1, 3, 2, 4).reshape(-1, len(FLUTTER_DATA_KEYS))
+
+    keys = {
+        'SUBCASE': np.full(nd*nm*n_modes*nv, subcase),
+        'MACH NUMBER': np.tile(np.repeat(grid.machs, n_modes*nv), nd),
+        'POINT': np.tile(np.repeat(np.arange(1, n_modes+1), nv), nd*nm),
+        'INDEX': np.tile(np.arange(nv), nd*nm*n_modes),
+    }
+    arrays = [keys[key].astype(dtype) for key, dtype in FLUTTER_INDEX_KEYS.items()]
+    names = list(FLUTTER_INDEX_KEYS.keys())
+    if nd > 1:
+        arrays.insert(0, np.repeat(grid.densities_ratio, nm*n_modes*nv))
+        names.insert(0, 'DENSITY RATIO')
+
+    index = pd.MultiIndex.from_arrays(arrays, names=names)
+    return pd.DataFrame(data, index=index, columns=list(FLUTTER_DATA_KEYS.keys()))
+
+
+def _solve_state_space(K, C, n_modes, vectors=True):
+    # roots (one of each conjugate pair, sorted by frequency) and their mode shapes
+    n = n_modes
+    C = np.asarray(C)
+    if C.ndim == 1:
+        # C = c I: the roots of p^2 + c p + mu = 0 for each eigenvalue mu of K share its eigenvector
+        if vectors:
+            mu, v = np.linalg.eig(K)
+        else:
+            mu, v = np.linalg.eigvals(K), None
+        c = C[:, None]
+        sqrt = np.sqrt(c**2 - 4*mu.astype(np.complex128))
+        p = np.concatenate([(-c + sqrt)/2, (-c - sqrt)/2], axis=1)
+        if v is not None:
+            v = np.concatenate([v, v], axis=2)
+    else:
+        A = np.zeros((len(K), 2*n, 2*n))
+        A[:, :n, n:] = np.eye(n)
+        A[:, n:, :n] = -K
+        A[:, n:, n:] = -C
+        if vectors:
+            p, v = np.linalg.eig(A)
+            v = v[:, :n, :]
+        else:
+            p, v = np.linalg.eigvals(A), None
+
+    select = np.argsort(-p.imag, axis=1)[:, :n]
+    select = np.take_along_axis(select, np.argsort(np.take_along_axis(p.imag, select, axis=1), axis=1), axis=1)
+    p = np.take_along_axis(p, select, axis=1)
+    if v is not None:
+        v = np.take_along_axis(v, select[:, None, :], axis=2)
+    return p, v
@@ -36,11 +36,11 @@ class FlutterAnalysisModel(AnalysisModel):
 
     def __init__(self, model: BDF = None, global_case = None,
                  subcases: Dict[int, Subcase] = {},
-                 params=None, diags=None, interface=None):
+                 params=None, diags=None, interface=None, meshes=None):
         super().__init__(model=model,
             global_case=global_case, subcases=subcases,
             params=params, diags=diags,
-            sol=145, interface=interface)
+            sol=145, interface=interface, meshes=meshes)
 
     def write_cards(self):
         super().write_cards()
@@ -7,6 +7,7 @@ from pyNastran.bdf.bdf import BDF
 
 from nastran.aero.superpanels import SuperAeroPanel5, SuperAeroPanel1
 from nastran.aero.analysis.flutter import FlutterSubcase, FlutterAnalysisModel
+from nastran.aero.cards import add_cord2rs, add_caero5s, add_set2s, add_spline2s
 
 
 class PanelFlutterSubcase(FlutterSubcase):
@@ -25,10 +26,10 @@ class PanelFlutterAnalysisModel(FlutterAnalysisModel):
     
     def __init__(self, model: BDF = None, global_case = None,
                  subcases: Dict[int, Subcase] = {},
-                 params=None, diags=None, interface=None,superpanels=None):
+                 params=None, diags=None, interface=None,superpanels=None, meshes=None):
         super().__init__(model=model, global_case=global_case,
                         subcases=subcases, params=params, diags=diags,
-                        interface=interface)
+                        interface=interface, meshes=meshes)
         self.superpanels = superpanels if superpanels is not None else []
 
     def add_superpanel(self, superpanel):
@@ -46,35 +47,31 @@ class PanelFlutterAnalysisModel(FlutterAnalysisModel):
         print('Aerodynamic Flutter solution created!')
 
     def _write_splines2_for_superpanel(self, superpanel, caeros, cords=None):
-        # SET and SPLINE cards
-        for i in range(superpanel.nchord):
-            # TODO: Make optional use of set2 or set1
-            # grid set (nodes) to the spline interpolation
-            # struct = spanel.aeropanels[i].structural_ids
-            # if type(struct) == int:
-            #     grid_group = model.sets[struct]
-            # elif len(list(struct)) > 0:
-            #     grid_group = model.add_set1(idutil.get_next_set_id(), list(struct))
-            # else:
-            #     raise Exception('Structural grid set for Splines could not be created.')
-
-            grid_group = self.model.add_set2(self.idutil.get_next_set_id(), caeros[i].eid, -0.01, 1.01, -0.01, 1.01)
-
-            # Linear Spline (SPLINE2) element
-            self.model.add_spline2(self.idutil.get_next_spline_id(),
-                                   caero=caeros[i].eid,
-                                   # Coordinate system of the CAERO5 element
-                                   # (Y-Axis must be colinear with "Elastic Axis")
-                                   cid=0 if cords is None else cords[i].cid,
-                                   id1=caeros[i].eid,
-                                   id2=caeros[i].eid + superpanel.nspan - 1,
-                                   setg=grid_group.sid,
-                                   # Detached bending and torsion (-1 -> infinity flexibility), only Z displacement
-                                   # allowed to comply with the rigid chord necessity of the Piston Theory
-                                   # and still model the plate bending (with N chord-wise elements).
-                                   dthx=-1.,
-                                   dthy=-1.,
-                                   dz=0.)
+        # SET and SPLINE cards of all strips at once
+        # TODO: Make optional use of set2 or set1
+        n = len(caeros)
+        eids = np.array([caero.eid for caero in caeros])
+
+        # grid set (nodes) to the spline interpolation
+        sids = self.idutil.reserve_ids('set', n) + np.arange(n)
+        add_set2s(self.model, sids, eids, -0.01, 1.01, -0.01, 1.01)
+
+        # Linear Spline (SPLINE2) element
+        add_spline2s(self.model,
+                     self.idutil.reserve_ids('spline', n) + np.arange(n),
+                     caeros=eids,
+                     id1s=eids,
+                     id2s=eids + superpanel.nspan - 1,
+                     setgs=sids,
+                     # Coordinate system of the CAERO5 element
+                     # (Y-Axis must be colinear with "Elastic Axis")
+                     cids=np.zeros(n, dtype=int) if cords is None else [cord.cid for cord in cords],
+                     # Detached bending and torsion (-1 -> infinity flexibility), only Z displacement
+                     # allowed to comply with the rigid chord necessity of the Piston Theory
+                     # and still model the plate bending (with N chord-wise elements).
+                     dthx=-1.,
+                     dthy=-1.,
+                     dz=0.)
 
     def _write_spline1_for_superpanel(self, elements):
         grid_group = self.model.add_set2(self.idutil.get_next_set_id(), elements['main'].eid, -0.01, 1.01, -0.01, 1.01)
@@ -117,46 +114,26 @@ class PanelFlutterPistonAnalysisModel(PanelFlutterAnalysisModel):
         self._write_splines2_for_superpanel(superpanel, caeros, cords)
 
     def _write_caero5_as_panel(self, superpanel: SuperAeroPanel5, paero, thickness_integrals):
-        # CORD2R and CAERO5 cards
-        # wind_x_vector = np.array([1., 0., 0.])
-
-        caeros = []
-        cords = []
-
-        id_increment = self.idutil.get_last_element_id()
-        for _, panel in superpanel.aeropanels.items():
-            # set origin to element mid chord (linear spline requires the Y axis to be colinear with the
-            # "elastic axis" of the structure, since it is a plate chord-wise divided,
-            # the elastic axis should be at mid chord)
-            origin = panel.p1 + panel.d12 / 2
-
-            # point in the XZ plane to define the coordinate system
-            # this hardcodes the Y axis of the local aerodynamic coordinate system
-            # to be colinear with the element Y axis (i.e. the vector of p1 to p4)
-            pxz_i = origin + panel.d12
-
-            # local aerodynamic coordinate system
-            cords.append(
-                self.model.add_cord2r(self.idutil.get_next_coord_id(),
-                                      origin,
-                                      origin + panel.normal,
-                                      pxz_i))
-
-            # CAERO5 element
-            caeros.append(
-                self.model.add_caero5(self.idutil.get_next_caero_id() + id_increment,
-                                      pid=paero.pid,
-                                      cp=0,
-                                      nspan=panel.nspan,
-                                      lspan=None,
-                                      nthick=thickness_integrals.sid,
-                                      p1=panel.p1,
-                                      x12=panel.l12,
-                                      p4=panel.p4,
-                                      x43=panel.l12,
-                                      ntheory=panel.theory)
-            )
-            id_increment = panel.nspan - 1
+        # CORD2R and CAERO5 cards of all strips at once
+        n = superpanel.nchord
+        strips = superpanel.strip_plates
+
+        # local aerodynamic coordinate systems
+        cids = self.idutil.reserve_ids('coord', n) + np.arange(n)
+        cords = add_cord2rs(self.model, cids, *superpanel.strip_coordinate_systems())
+
+        # CAERO5 elements, the boxes of each strip are numbered from its id
+        first_eid = self.idutil.get_next_caero_id() + self.idutil.get_last_element_id()
+        caeros = add_caero5s(self.model,
+                             first_eid + superpanel.nspan*np.arange(n),
+                             pid=paero.pid,
+                             p1s=strips.p1,
+                             x12s=strips.chord,
+                             p4s=strips.p4,
+                             x43s=strips.chord,
+                             nspan=superpanel.nspan,
+                             nthick=thickness_integrals.sid,
+                             ntheory=superpanel.ntheory)
         return caeros, cords
 
 
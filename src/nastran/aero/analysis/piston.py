@@ -0,0 +1,128 @@
+import numpy as np
+
+from nastran.aero.analysis.eigen import FlutterGrid, solve_flutter_grid, flutter_roots_to_df
+
+# Ritz functions of the plate (chordwise x spanwise)
+PISTON_RITZ_SIZE = (8, 4)
+
+
+class PistonPanelFlutterSolver:
+    """
+    In-process panel flutter solver of a simply supported rectangular plate (a `StructuralPlate`
+    with `D` and `areal_density`, e.g. `LaminatedStructuralPlate`) with first order piston
+    theory aerodynamics, for design screening without NASTRAN.
+
+    The plate is a Rayleigh-Ritz model of sine modes sin(m pi x/a) sin(n pi y/b), x along the
+    chord (p1 to p2, the flow direction) and y along the span (p1 to p4), integrated with
+    Gauss quadrature. It is reduced to its `n_modes` lowest vibration modes, as NASTRAN does,
+    and the aeroelastic roots of every (density ratio, Mach number, velocity) point are the
+    eigenvalues of the state space system, solved in batches by `solve_flutter_grid`.
+
+    Units follow the NASTRAN model (e.g. mm, t, s), the results follow the SOL 145 PK conventions
+    and the `flutter_pages_to_df` layout, so `get_critical_roots` and the plot functions work on them.
+    """
+
+    def __init__(self, plate, n_modes=None, ritz_size=PISTON_RITZ_SIZE, gauss_points=None):
+        self.a = plate.l12
+        self.b = plate.l14
+        self.D = np.asarray(plate.D, dtype=np.float64)
+        self.areal_density = plate.areal_density
+        self.ritz_size = ritz_size
+        self.n_modes = n_modes if n_modes is not None else ritz_size[0]*ritz_size[1]
+        if self.n_modes > ritz_size[0]*ritz_size[1]:
+            raise ValueError('More modes ({}) than Ritz functions {}.'.format(self.n_modes, ritz_size))
+        self.gauss_points = gauss_points if gauss_points is not None else 2*max(ritz_size) + 8
+        self._assemble()
+
+    def __repr__(self):
+        return 'Piston Theory Panel Flutter Solver of a {}x{} plate with {} modes.'.format(self.a, self.b, self.n_modes)
+
+    @property
+    def frequencies(self):
+        """
+        Natural frequencies (Hz) of the retained modes.
+        """
+        return np.sqrt(self.eigenvalues) / (2*np.pi)
+
+    def solve(self, machs, velocities, densities_ratio=(1.,), ref_rho=1., ref_chord=None, vref=1., subcase=1,
+              track_modes=True):
+        """
+        Flutter roots at every velocity of every Mach number and density ratio (the air density is
+        `ref_rho` times the ratio). VELOCITY is reported divided by `vref` and KFREQ refers
+        to the semi chord of `ref_chord` (default: the plate chord). The modes are tracked
+        through the velocities by their eigenvectors (see `solve_flutter_grid`).
+
+        Returns a DataFrame in the `flutter_pages_to_df` layout, with an outer DENSITY RATIO index
+        level if there is more than one density ratio.
+        """
+        grid = FlutterGrid(machs, velocities, densities_ratio, ref_rho)
+        if np.any(grid.machs <= 1.):
+            raise ValueError('Piston theory requires supersonic Mach numbers.')
+        ref_chord = ref_chord if ref_chord is not None else self.a
+
+        roots = solve_flutter_grid(self.system_matrices, grid, self.n_modes, track_modes)
+        return flutter_roots_to_df(roots, grid, ref_chord/2, vref, subcase)
+
+    def solve_case(self, global_case, subcase=1, track_modes=True):
+        """
+        Solves the flutter global case of a `FlutterAnalysisModel` (machs, velocities,
+        densities_ratio, ref_rho, ref_chord and vref).
+        """
+        return self.solve(global_case.machs, global_case.velocities, global_case.densities_ratio,
+                          global_case.ref_rho, global_case.ref_chord, getattr(global_case, 'vref', 1.), subcase,
+                          track_modes)
+
+    def system_matrices(self, mach, rho, velocity):
+        """
+        Modal stiffness matrices (npoints, n_modes, n_modes) of the aeroelastic system and its
+        damping, proportional to the identity modal mass, as the (npoints,) coefficients.
+        """
+        mach, rho, velocity = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (mach, rho, velocity)))
+        beta = np.sqrt(mach**2 - 1)
+        stiffness = rho * velocity**2 / beta
+        damping = rho * velocity / beta * (mach**2 - 2) / (mach**2 - 1) / self.areal_density
+        K = np.diag(self.eigenvalues) + stiffness.reshape(-1, 1, 1) * self.aero_stiffness
+        return K, damping
+
+    def _assemble(self):
+        nx, ny = self.ritz_size
+        X = _gauss_integrals(nx, self.a, self.gauss_points)
+        Y = _gauss_integrals(ny, self.b, self.gauss_points)
+        (D11, D12, D16), (_, D22, D26), (_, _, D66) = self.D
+
+        def product(p, q, r, s):
+            # integral of the (p, q) x derivatives and (r, s) y derivatives of the Ritz functions
+            return np.einsum('mk,nl->mnkl', X[p, q], Y[r, s]).reshape(nx*ny, nx*ny)
+
+        M = self.areal_density * product(0, 0, 0, 0)
+        K = (D11*product(2, 2, 0, 0) + D22*product(0, 0, 2, 2)
+             + D12*(product(2, 0, 0, 2) + product(0, 2, 2, 0)) + 4*D66*product(1, 1, 1, 1)
+             + 2*D16*(product(2, 1, 0, 1) + product(1, 2, 1, 0))
+             + 2*D26*(product(0, 1, 2, 1) + product(1, 0, 1, 2)))
+
+        # mass normalized vibration modes, from the standard problem of the Cholesky factor M = L L^T
+        L_inv = np.linalg.inv(np.linalg.cholesky(M))
+        eigenvalues, vectors = np.linalg.eigh(L_inv @ K @ L_inv.T)
+        vectors = L_inv.T @ vectors[:, :self.n_modes]
+        self.eigenvalues = eigenvalues[:self.n_modes]
+        self.modes = vectors
+        # piston theory pressure slope term (integral of phi_i dphi_j/dx)
+        self.aero_stiffness = vectors.T @ product(0, 1, 0, 0) @ vectors
+
+
+def sine_functions(n, length, x):
+    """
+    Values and first and second derivatives (3, n, len(x)) of the sine functions sin(m pi x/L), m = 1..n.
+    """
+    k = np.pi * np.arange(1, n+1)[:, None] / length
+    s, c = np.sin(k*x), np.cos(k*x)
+    return np.stack([s, k*c, -k**2*s])
+
+
+def _gauss_integrals(n, length, npoints):
+    # integrals (3, 3, n, n) of the products of the derivatives of the sine functions
+    x, w = np.polynomial.legendre.leggauss(npoints)
+    x = (x + 1) * length / 2
+    w = w * length / 2
+    f = sine_functions(n, length, x)
+    return np.einsum('pmx,qkx,x->pqmk', f, f, w)
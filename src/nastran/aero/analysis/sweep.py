@@ -0,0 +1,171 @@
+import io
+import os
+import itertools
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nastran.bdf_writer import write_bdf
+from nastran.structures.composite import Ply
+from nastran.structures.panel import LaminatedStructuralPlate
+from nastran.structures.mesh import PlateMesh
+from nastran.structures.bc import create_spcs_and_subcases, generate_bc_case
+from nastran.aero.superpanels import SuperAeroPanel5
+from nastran.aero.analysis.panel_flutter import PanelFlutterPistonAnalysisModel, PanelFlutterSubcase
+
+SWEEP_DEFAULTS = {
+    'a': 100.,              # chordwise length
+    'aspect_ratio': 1.,     # a/b
+    'nchord': 20,
+    'nspan': 20,
+    'theta': 45.,           # ply angle (angle ply laminate)
+    'nplies': 6,
+    'thick': 0.2,           # ply thickness
+    'bc': 'SSSS',           # see `generate_bc_case`
+    'mach': 3.0,
+    'theory': 'VANDYKE',
+}
+
+# parameters that only change the PCOMP card of the deck
+LAMINATE_KEYS = ('theta', 'nplies', 'thick')
+# parameters of the plate mesh
+MESH_KEYS = ('a', 'aspect_ratio', 'nchord', 'nspan')
+
+PANEL_PID = 1
+
+
+def sweep_grid(**values):
+    """
+    Cases of the cartesian product of the parameter values, e.g.
+    sweep_grid(theta=[0, 15, 30], mach=[2., 3.]) -> 6 cases.
+    """
+    keys = list(values.keys())
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values.values())]
+
+
+class PanelFlutterSweep:
+    """
+    Generates the SOL 145 decks of a laminated panel with piston theory aerodynamics (the
+    workflow of the Composite notebook) for every case of a parameter grid.
+
+    Cases are grouped by their non-laminate parameters. The deck of each group is built once
+    (plate, SPCs, aero panels, splines and flutter cards) from a mesh shared by all groups
+    of the same geometry, and the deck of each case of the group is this template with its own
+    PCOMP card. With `workers` > 1 the groups are built and written in a pool of processes.
+    """
+
+    def __init__(self, material, config, params, defaults=None):
+        self.material = material
+        self.config = config
+        self.params = params
+        self.defaults = dict(SWEEP_DEFAULTS)
+        if defaults is not None:
+            self.defaults.update(defaults)
+
+    def __repr__(self):
+        return 'Panel Flutter Sweep over {}.'.format(self.defaults)
+
+    def cases(self, grid):
+        """
+        Full parameters of each case of the grid (a list of dicts, see `sweep_grid`).
+        """
+        unknown = {k for case in grid for k in case} - set(self.defaults)
+        if unknown:
+            raise ValueError('Unknown sweep parameters: {}'.format(sorted(unknown)))
+        return pd.DataFrame([dict(self.defaults, **case) for case in grid])
+
+    def write(self, grid, directory, prefix='case', workers=None):
+        """
+        Writes the deck of each case of the grid to `directory` and returns the cases
+        (as `cases`) with the deck filename in the 'bdf' column.
+        """
+        os.makedirs(directory, exist_ok=True)
+        cases = self.cases(grid)
+        cases['bdf'] = [os.path.join(directory, '{}{:04d}.bdf'.format(prefix, i)) for i in range(len(cases))]
+
+        template_keys = [k for k in cases.columns if k not in LAMINATE_KEYS and k != 'bdf']
+        groups = [group.to_dict('records') for _, group in cases.groupby(template_keys, sort=False)]
+
+        if workers is not None and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_write_group, [self]*len(groups), groups))
+        else:
+            meshes = {}
+            for group in groups:
+                _write_group(self, group, meshes)
+        return cases
+
+    def build(self, case, mesh=None):
+        """
+        Analysis model of a single case (a dict of parameters). The plate reuses `mesh` if given;
+        its cards are not in the model but written from the mesh arrays (`analysis.meshes`).
+        """
+        case = dict(self.defaults, **case)
+        p1, p2, p3, p4 = panel_points(case['a'], case['aspect_ratio'])
+
+        ply = Ply.angle_ply(PANEL_PID, case['theta'], case['nplies'], case['thick'], self.material)
+        plate = LaminatedStructuralPlate(p1, p2, p3, p4, case['nspan'], case['nchord'], ply)
+        if mesh is None:
+            plate.generate_mesh()
+        else:
+            plate.mesh = mesh
+
+        config = dict(self.config, machs=[case['mach']])
+        analysis = PanelFlutterPistonAnalysisModel(plate.to_bdf(mesh_cards=False), params=self.params, subcases={},
+                                                   meshes=[plate.mesh])
+        analysis.set_global_case_from_dict(config)
+
+        nodes = plate.limit_nodes()
+        nodes[2] = nodes[2][1:-1]
+        nodes[3] = nodes[3][1:-1]
+        create_spcs_and_subcases(analysis, {1: generate_bc_case(case['bc'])}, nodes, PanelFlutterSubcase)
+
+        analysis.add_superpanel(SuperAeroPanel5(1, p1, p2, p3, p4, case['nchord'], case['nspan'], theory=case['theory']))
+        analysis.write_cards()
+        return analysis
+
+
+def panel_points(a, aspect_ratio):
+    b = a/aspect_ratio
+    p1 = np.array([0., 0., 0.])
+    p2 = p1 + np.array([a, 0., 0.])
+    p3 = p1 + np.array([a, b, 0.])
+    p4 = p1 + np.array([0., b, 0.])
+    return p1, p2, p3, p4
+
+
+def _write_group(sweep, group, meshes=None):
+    # the template deck is built with the laminate of the first case
+    first = group[0]
+    meshes = {} if meshes is None else meshes
+    mesh_key = tuple(first[k] for k in MESH_KEYS)
+    if mesh_key not in meshes:
+        p1, p2, p3, p4 = panel_points(first['a'], first['aspect_ratio'])
+        meshes[mesh_key] = PlateMesh.structured(p1, p2 - p1, p4 - p1, first['nchord'], first['nspan'], PANEL_PID,
+                                                theta_mcid=90.0)
+
+    analysis = sweep.build(first, meshes[mesh_key])
+    with io.StringIO() as buffer:
+        write_bdf(analysis.model, buffer, analysis.meshes, enddata=True)
+        template = buffer.getvalue()
+    template_pcomp = _pcomp_card(sweep, first)
+
+    if template.count(template_pcomp) != 1:  # can't patch the template
+        template = None
+
+    for case in group:
+        if template is None:
+            with io.StringIO() as buffer:
+                analysis = sweep.build(case, meshes[mesh_key])
+                write_bdf(analysis.model, buffer, analysis.meshes, enddata=True)
+                deck = buffer.getvalue()
+        else:
+            deck = template.replace(template_pcomp, _pcomp_card(sweep, case))
+        with open(case['bdf'], 'w') as file:
+            file.write(deck)
+
+
+def _pcomp_card(sweep, case):
+    return Ply.angle_ply(PANEL_PID, case['theta'], case['nplies'], case['thick'], sweep.material).to_pcomp().write_card()
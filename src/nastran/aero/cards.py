@@ -0,0 +1,62 @@
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.cards.coordinate_systems import CORD2R
+from pyNastran.bdf.cards.aero.aero import CAERO5, SPLINE2
+from pyNastran.bdf.cards.bdf_sets import SET2
+
+import numpy as np
+
+from nastran.utils import check_new_ids
+
+
+def add_cord2rs(bdf: BDF, cids, origins, zaxes, xzplanes):
+    """
+    Adds the CORD2R cards (in the basic system) of (n, 3) arrays of origins, points on the z axis and
+    points on the xz plane at once.
+    """
+    cids = np.asarray(cids).tolist()
+    check_new_ids(bdf.coords, cids, 'CORD2R')
+    # the cards keep the arrays given, each one gets its own (writeable) copy
+    coords = [CORD2R(cid, np.array(origin, dtype=float), np.array(zaxis, dtype=float), np.array(xzplane, dtype=float))
+              for cid, origin, zaxis, xzplane in zip(cids, origins, zaxes, xzplanes)]
+    _add_cards(bdf, bdf.coords, cids, coords, 'CORD2R')
+    return coords
+
+
+def add_caero5s(bdf: BDF, eids, pid, p1s, x12s, p4s, x43s, nspan, nthick, ntheory, cp=0, lspan=None):
+    """
+    Adds the CAERO5 cards of (n, 3) arrays of leading edge points and (n,) arrays of chords at once.
+    """
+    eids = np.asarray(eids).tolist()
+    check_new_ids(bdf.caeros, eids, 'CAERO5')
+    caeros = [CAERO5(eid, pid, np.array(p1, dtype=float), x12, np.array(p4, dtype=float), x43, cp=cp, nspan=nspan, lspan=lspan, ntheory=ntheory, nthick=nthick)
+              for eid, p1, x12, p4, x43 in zip(eids, p1s, np.asarray(x12s).tolist(), p4s, np.asarray(x43s).tolist())]
+    _add_cards(bdf, bdf.caeros, eids, caeros, 'CAERO5')
+    return caeros
+
+
+def add_set2s(bdf: BDF, sids, macros, sp1, sp2, ch1, ch2):
+    """
+    Adds a SET2 card (with the same prism limits) for each aerodynamic macro element.
+    """
+    sids = np.asarray(sids).tolist()
+    check_new_ids(bdf.sets, sids, 'SET2')
+    sets = [SET2(sid, macro, sp1, sp2, ch1, ch2) for sid, macro in zip(sids, np.asarray(macros).tolist())]
+    _add_cards(bdf, bdf.sets, sids, sets, 'SET2')
+    return sets
+
+
+def add_spline2s(bdf: BDF, eids, caeros, id1s, id2s, setgs, cids, dz=0.0, dthx=0.0, dthy=0.0):
+    """
+    Adds the SPLINE2 cards of arrays of CAERO, box, SET and coordinate system ids at once.
+    """
+    eids = np.asarray(eids).tolist()
+    check_new_ids(bdf.splines, eids, 'SPLINE2')
+    splines = [SPLINE2(eid, caero, id1, id2, setg, dz=dz, cid=cid, dthx=dthx, dthy=dthy)
+               for eid, caero, id1, id2, setg, cid in zip(eids, *(np.asarray(v).tolist() for v in (caeros, id1s, id2s, setgs, cids)))]
+    _add_cards(bdf, bdf.splines, eids, splines, 'SPLINE2')
+    return splines
+
+
+def _add_cards(bdf, cards, ids, objects, card_type):
+    cards.update(zip(ids, objects))
+    bdf._type_to_id_map[card_type].extend(ids)
@@ -2,7 +2,7 @@
 from typing import Any, Dict
 
 from numpy.lib.utils import deprecate
-from nastran.geometry.panels import RectangularPlate
+from nastran.geometry.panels import RectangularPlate, PlateArray
 from nastran.aero.panels import AeroPanel, AeroPanel1, AeroPanel5
 
 import numpy as np
@@ -65,6 +65,9 @@ class SuperAeroPanel1(SuperAeroPanel):
 class SuperAeroPanel5(SuperAeroPanel):
     """
     A superelement which holds CEARO5 elements (strips) for modeling chordwise flexiblity.
+
+    The strips are kept as a `PlateArray` (`strip_plates`, of corner points `strips` (nchord, 4, 3));
+    the AeroPanel5 objects of the strips are built only when `aeropanels` is first accessed.
     """
 
     def __init__(self, eid, p1, p2, p3, p4, nchord, nspan, aeropanels: Dict[int, AeroPanel5]=None, theory='PISTON'):
@@ -74,17 +77,59 @@ class SuperAeroPanel5(SuperAeroPanel):
         self.thick_int = [0., 0., 0., 0., 0., 0.]  # TODO: calculate on time
         self.ctrl_surf = [0. for _ in range(self.nspan)]  # for each strip TODO: make this customizable
 
-        # generate the AeroPanel objects
+        # generate the strips
         self._create_aero5_panels(theory)
 
-    def _create_aero5_panels(self, theory):
-        for i in range(self.nchord):
-            p1 = self.p1 + self.d12 * i / self.nchord
-            p4 = self.p4 + self.d12 * i / self.nchord
-            p2 = p1 + self.d12 / self.nchord
-            p3 = p4 + self.d12 / self.nchord
-            self.aeropanels[i] = AeroPanel5(p1, p2, p3, p4, 1, self.nspan, theory=theory,
-                thickness_integrals=self.thick_int,
-                control_surface_ratios=self.ctrl_surf)
-        
+    @property
+    def aeropanels(self) -> Dict[int, AeroPanel5]:
+        if self._pending_strips:
+            for i, (p1, p2, p3, p4) in enumerate(self.strips):
+                self._aeropanels[i] = AeroPanel5(p1, p2, p3, p4, 1, self.nspan, theory=self.theory,
+                    thickness_integrals=self.thick_int,
+                    control_surface_ratios=self.ctrl_surf)
+            self._pending_strips = False
+        return self._aeropanels
+
+    @aeropanels.setter
+    def aeropanels(self, aeropanels: Dict[int, AeroPanel5]):
+        self._aeropanels = aeropanels
+        self._pending_strips = False
+
+    @property
+    def strips(self):
+        return self.strip_plates.points
+
+    @property
+    def ntheory(self) -> int:
+        return AeroPanel5.THEORIES[self.theory]
+
+    def strip_coordinate_systems(self):
+        """
+        Origin, point on the z axis and point on the xz plane (each as a (nchord, 3) array) of the
+        local aerodynamic coordinate system of each strip.
+        """
+        strips = self.strip_plates
+        d12, normal = strips.d12, strips.normal
 
+        # set origin to element mid chord (linear spline requires the Y axis to be colinear with the
+        # "elastic axis" of the structure, since it is a plate chord-wise divided,
+        # the elastic axis should be at mid chord)
+        origin = strips.p1 + d12 / 2
+
+        # point in the XZ plane to define the coordinate system
+        # this hardcodes the Y axis of the local aerodynamic coordinate system
+        # to be colinear with the element Y axis (i.e. the vector of p1 to p4)
+        return origin, origin + normal, origin + d12
+
+    def _create_aero5_panels(self, theory):
+        if theory not in AeroPanel5.THEORIES:
+            raise Exception('Theory {} for CAERO5 is not present.'.format(theory))
+        self.theory = theory
+
+        i = np.arange(self.nchord).reshape(-1, 1)
+        p1 = self.p1 + self.d12 * i / self.nchord
+        p4 = self.p4 + self.d12 * i / self.nchord
+        p2 = p1 + self.d12 / self.nchord
+        p3 = p4 + self.d12 / self.nchord
+        self.strip_plates = PlateArray(np.stack([p1, p2, p3, p4], axis=1))
+        self._pending_strips = True
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from copy import copy
+from collections import defaultdict
 from typing import Dict, Type
 from numpy.lib.utils import deprecate
 
@@ -6,6 +8,7 @@ from numpy.lib.utils import deprecate
 from pyNastran.bdf.bdf import BDF, CaseControlDeck
 
 from nastran.utils import IdUtility, set_object_properties
+from nastran.bdf_writer import write_bdf
 
 class ExecutiveControl:
     pass
@@ -53,9 +56,12 @@ class AnalysisModel(ABC):
                  params=None,
                  diags=None,
                  sol=None,
-                 interface=None):
+                 interface=None,
+                 meshes=None):
         self.model = model if model is not None else BDF(debug=False)
-        self.idutil = IdUtility(self.model)
+        # meshes (e.g. PlateMesh) written from their arrays, whose cards are not in the model
+        self.meshes = meshes if meshes is not None else []
+        self.idutil = IdUtility(self.model, self.meshes)
         self.global_case = global_case if global_case is not None else CaseControl()
         self.subcases = subcases if subcases is not None else {}
         self.params = params
@@ -73,7 +79,7 @@ class AnalysisModel(ABC):
 
         if reset_bdf:
             self.model = BDF(debug=False)
-            self.idutil = IdUtility(self.model)
+            self.idutil = IdUtility(self.model, self.meshes)
 
         print("Loading base bdf model to pyNastran...")
         base_model.read_bdf(bdf_file_name)
@@ -137,10 +143,22 @@ class AnalysisModel(ABC):
 
         return sub
 
-    def export_to_bdf(self, output_bdf):
+    def export_to_bdf(self, output_bdf, fast=True):
         # Write output
         print('Writing bdf file...')
-        self.model.write_bdf(output_bdf, enddata=True)
+        if fast:
+            # the mesh cards are written from the mesh arrays
+            write_bdf(self.model, output_bdf, meshes=self.meshes, enddata=True)
+        else:
+            # all cards written by pyNastran, from a copy of the model with the mesh cards (the
+            # other cards are shared, BDF.__deepcopy__ fails on some aero cards)
+            model = copy(self.model)
+            model.nodes = dict(self.model.nodes)
+            model.elements = dict(self.model.elements)
+            model._type_to_id_map = defaultdict(list, {key: list(ids) for key, ids in self.model._type_to_id_map.items()})
+            for mesh in self.meshes:
+                mesh.to_bdf(model)
+            model.write_bdf(output_bdf, enddata=True)
         print('Done!')
 
     def write_cards(self):
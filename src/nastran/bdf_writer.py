@@ -0,0 +1,60 @@
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.field_writer_8 import print_float_8
+from pyNastran.bdf.field_writer_16 import print_float_16
+
+from nastran.utils import check_new_ids
+
+WRITE_BUFFER_SIZE = 4 * 1024**2  # bytes
+
+
+def write_bdf(model: BDF, out_filename, meshes=(), size: int = 8, is_double: bool = False, enddata: bool = None):
+    """
+    Writes the model with `BDF.write_bdf`, followed by the GRID and CQUAD4 cards of the
+    `meshes` (e.g. `PlateMesh`), which are written straight from their arrays and are not cards
+    of the model. `out_filename` may also be an open text file.
+
+    Without meshes the file is the one of `BDF.write_bdf`. With meshes it holds the same cards,
+    but the mesh cards come after all the model cards and the card counts of the header leave
+    them out.
+    """
+    if meshes and is_double:
+        raise ValueError('meshes are written in single precision only, is_double=True is not supported')
+    for mesh in meshes:
+        check_new_ids(model.nodes, mesh.nids.tolist(), 'GRID')
+        check_new_ids(model.elements, mesh.eids.tolist(), 'CQUAD4')
+
+    encoding = model.get_encoding(None)
+    if hasattr(out_filename, 'write'):  # an open file
+        _write_bdf(model, out_filename, meshes, encoding, size, is_double, enddata)
+    else:
+        with open(out_filename, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE) as file:
+            _write_bdf(model, file, meshes, encoding, size, is_double, enddata)
+
+
+def format_grids(nids, xyz, size=8, cps=None):
+    """
+    GRID cards (with default CD, PS and SEID) of the nodes as a single string.
+    """
+    if size == 8:
+        template = 'GRID    %8i%8s%s%s%s\n'
+        print_float = print_float_8
+    else:
+        template = 'GRID*   %16i%16s%16s%16s\n*       %16s' + ' '*48 + '\n'
+        print_float = print_float_16
+
+    # coordinates of structured meshes repeat a lot, each value is formatted only once
+    values, inverse = np.unique(np.asarray(xyz, dtype=np.float64), return_inverse=True)
+    fields = np.array([print_float(v) for v in values.tolist()], dtype=object)[inverse.reshape(-1, 3)]
+    cps = ['']*len(nids) if cps is None else cps
+    return ''.join([template % (nid, cp, x, y, z) for nid, cp, (x, y, z) in zip(nids, cps, fields.tolist())])
+
+
+def _write_bdf(model, file, meshes, encoding, size, is_double, enddata):
+    model.write_bdf(file, encoding=encoding, size=size, is_double=is_double, enddata=False, close=False)
+    for mesh in meshes:
+        mesh.write_bulk(file, size)
+    # same rule of BDF.write_bdf
+    if enddata or (enddata is None and 'ENDDATA' in model.card_count):
+        file.write('ENDDATA\n')
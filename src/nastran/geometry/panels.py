@@ -1,55 +1,179 @@
 
 import numpy as np
 
+class PlateGeometry:
+    """
+    Immutable geometry of a plate given by its 4 corner points (3,), or of a stack of plates with
+    corner points (..., 3). The edge vectors, lengths and unit vectors are computed once, as
+    read-only arrays.
+    """
+
+    __slots__ = ('p1', 'p2', 'p3', 'p4', 'd12', 'l12', 'd14', 'l14', 'd43', 'l43', 'd23', 'l23',
+                 'n12', 'n14', 'normal')
+
+    def __init__(self, p1, p2, p3, p4):
+        p1, p2, p3, p4 = np.array(p1), np.array(p2), np.array(p3), np.array(p4)
+        d12, d14, d43, d23 = p2 - p1, p4 - p1, p3 - p4, p3 - p2
+        l12, l14, l43, l23 = (np.linalg.norm(d, axis=-1) for d in (d12, d14, d43, d23))
+        normal = np.cross(d12, d14)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n12 = d12 / l12[..., None]
+            n14 = d14 / l14[..., None]
+            normal = normal / np.linalg.norm(normal, axis=-1, keepdims=True)
+
+        values = dict(p1=p1, p2=p2, p3=p3, p4=p4, d12=d12, l12=l12, d14=d14, l14=l14,
+                      d43=d43, l43=l43, d23=d23, l23=l23, n12=n12, n14=n14, normal=normal)
+        self._freeze(values)
+
+    def _freeze(self, values):
+        for name, value in values.items():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('PlateGeometry is immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('PlateGeometry is immutable.')
+
+    def __reduce__(self):
+        return PlateGeometry, (self.p1, self.p2, self.p3, self.p4)
+
+
+class PlateArray(PlateGeometry):
+    """
+    N plates held as a (N, 4, 3) array of corner points, with the geometry of all plates
+    computed at once (e.g. `d12` is (N, 3) and `l12` is (N,)).
+    """
+
+    __slots__ = ('points',)
+
+    def __init__(self, points):
+        points = np.array(points)
+        if points.ndim != 3 or points.shape[1:] != (4, 3):
+            raise ValueError('Expected a (N, 4, 3) array of points, got {}.'.format(points.shape))
+        super().__init__(*(points[:, i] for i in range(4)))
+        self._freeze({'points': points})
+
+    def __repr__(self):
+        return 'Array of {} plates.'.format(len(self))
+
+    def __len__(self):
+        return len(self.points)
+
+    def __reduce__(self):
+        return PlateArray, (self.points,)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return RectangularPlate(*self.points[i])
+        return PlateArray(self.points[i])
+
+    @property
+    def chord(self):
+        return self.l12
+
+    @property
+    def span(self):
+        return self.l14
+
+    @classmethod
+    def from_plates(cls, plates):
+        return cls([plate.limit_points for plate in plates])
+
+
 class Plate:
+    """
+    Generic plate defined by 4 points in the space. The derived geometry (`geometry`) is computed
+    on first access and kept until the points change (see `set_plate_limits`). The points are
+    returned as copies, the (read-only) derived quantities are not.
+    """
+
+    __slots__ = ('_limits', '_geometry')
 
     def __init__(self, p1, p2, p3, p4) -> None:
-        self.p1 = np.array(p1)
-        self.p2 = np.array(p2)
-        self.p3 = np.array(p3)
-        self.p4 = np.array(p4)
-    
+        self.set_plate_limits(p1, p2, p3, p4)
+
+    @property
+    def geometry(self) -> PlateGeometry:
+        if self._geometry is None:
+            self._geometry = PlateGeometry(*self._limits)
+        return self._geometry
+
+    @property
+    def p1(self):
+        return self.geometry.p1.copy()
+
+    @p1.setter
+    def p1(self, p1):
+        self.set_plate_limits(p1, *self._limits[1:])
+
+    @property
+    def p2(self):
+        return self.geometry.p2.copy()
+
+    @p2.setter
+    def p2(self, p2):
+        p1, _, p3, p4 = self._limits
+        self.set_plate_limits(p1, p2, p3, p4)
+
+    @property
+    def p3(self):
+        return self.geometry.p3.copy()
+
+    @p3.setter
+    def p3(self, p3):
+        p1, p2, _, p4 = self._limits
+        self.set_plate_limits(p1, p2, p3, p4)
+
+    @property
+    def p4(self):
+        return self.geometry.p4.copy()
+
+    @p4.setter
+    def p4(self, p4):
+        self.set_plate_limits(*self._limits[:3], p4)
+
     @property
     def d12(self):
-        return self.p2 - self.p1
-    
+        return self.geometry.d12
+
     @property
     def l12(self):
-        return np.linalg.norm(self.d12)
+        return self.geometry.l12
 
     @property
     def d14(self):
-        return self.p4 - self.p1
+        return self.geometry.d14
 
     @property
     def l14(self):
-        return np.linalg.norm(self.d14)
+        return self.geometry.l14
 
     @property
     def d43(self):
-        return self.p3 - self.p4
+        return self.geometry.d43
 
     @property
     def l43(self):
-        return np.linalg.norm(self.d43)
+        return self.geometry.l43
 
     @property
     def d23(self):
-        return self.p3 - self.p2
+        return self.geometry.d23
 
     @property
     def l23(self):
-        return np.linalg.norm(self.d23)
+        return self.geometry.l23
 
     @property
     def limit_points(self):
         return self.p1, self.p2, self.p3, self.p4
 
     def set_plate_limits(self, p1, p2, p3, p4):
-        self.p1 = p1
-        self.p2 = p2
-        self.p3 = p3
-        self.p4 = p4
+        self._limits = (np.array(p1), np.array(p2), np.array(p3), np.array(p4))
+        self._geometry = None
 
 
 class RectangularPlate(Plate):
@@ -57,25 +181,26 @@ class RectangularPlate(Plate):
     Generic rectangular plate defined by 4 points in the space.
     """
 
+    __slots__ = ()
+
     def __init__(self, p1, p2, p3, p4):
         super().__init__(p1, p2, p3, p4)
 
     @property
     def n12(self):
-        return self.d12/self.chord
+        return self.geometry.n12
 
     @property
     def n14(self):
-        return self.d14/self.span
+        return self.geometry.n14
 
     @property
     def normal(self):
-        vec = np.cross(self.d12, self.d14)
-        return vec/np.linalg.norm(vec)
+        return self.geometry.normal
 
     @property
     def span(self):
-        return np.linalg.norm(self.d14)
+        return self.l14
 
     @property
     def b(self):
@@ -83,7 +208,7 @@ class RectangularPlate(Plate):
 
     @property
     def chord(self):
-        return np.linalg.norm(self.d12)
+        return self.l12
 
     @property
     def a(self):
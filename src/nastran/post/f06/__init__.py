@@ -1 +1,2 @@
 from nastran.post.f06.f06 import *
+from nastran.post.f06.op2 import *
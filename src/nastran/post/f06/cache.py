@@ -0,0 +1,195 @@
+import os
+import json
+import zipfile
+import hashlib
+import datetime
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 3
+CACHE_ENTRY_SUFFIX = '.f06c'
+CACHE_HEADER = '__header__'
+CACHE_MANIFEST = 'manifest.json'
+CACHE_MANIFEST_MAX_ENTRIES = 4096
+CACHE_MAX_SIZE = 2 * 1024**3  # bytes
+
+# attributes of the pages not kept in the cache (the raw text is not needed once parsed)
+CACHE_SKIPPED_ATTRS = ('_raw_lines', '_df', 'span')
+
+HASH_CHUNK_SIZE = 1024**2
+
+
+class F06Cache:
+    """
+    On-disk cache of parsed F06 results keyed by the content hash of the file.
+
+    The hash of each file is remembered with its size and mtime (for the last
+    `CACHE_MANIFEST_MAX_ENTRIES` files read), so an unchanged file is not read again to be hashed.
+    Entries are compressed `np.savez` archives of the tables of the pages, one array per page
+    class, plus a JSON header with the class name, metadata and table rows of each page. Text
+    pages and raw lines are not cached. Entries are evicted by least recent use once the cache
+    directory is larger than `max_size` bytes.
+    """
+
+    def __init__(self, directory, max_size=CACHE_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._manifest = self._load_manifest()
+
+    def __repr__(self):
+        return 'F06 Cache at {} with {} entries.'.format(self.directory, len(self._entries()))
+
+    def get(self, filename):
+        """
+        Cached (non text) pages of the F06 file, or None if the file content is not in the cache.
+        """
+        path = self._entry_path(self.key(filename))
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                header = json.loads(str(data[CACHE_HEADER]), object_hook=_decode_json)
+                if header.get('version') != CACHE_VERSION:
+                    return None
+                arrays = {key: data[key] for key in data.files if key != CACHE_HEADER}
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None  # entry of an older cache version
+        os.utime(path)  # most recently used
+        return _decode_pages(header, arrays)
+
+    def put(self, filename, pages):
+        path = self._entry_path(self.key(filename))
+        header, arrays = _encode_pages(pages)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            np.savez_compressed(file, **{CACHE_HEADER: np.array(header)}, **arrays)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def key(self, filename):
+        stat = os.stat(filename)
+        name = os.path.abspath(filename)
+        entry = self._manifest.get(name)
+        if entry is not None and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return entry[2]
+        digest = _hash_file(filename)
+        # the oldest hashed files are forgotten first
+        self._manifest.pop(name, None)
+        self._manifest[name] = [stat.st_size, stat.st_mtime_ns, digest]
+        for old in list(self._manifest)[:-CACHE_MANIFEST_MAX_ENTRIES]:
+            del self._manifest[old]
+        self._save_manifest()
+        return digest
+
+    def clear(self):
+        for path in self._entries():
+            os.remove(path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + CACHE_ENTRY_SUFFIX)
+
+    def _entries(self):
+        return [os.path.join(self.directory, f) for f in os.listdir(self.directory)
+                if f.endswith(CACHE_ENTRY_SUFFIX)]
+
+    def _evict(self):
+        entries = sorted(((os.stat(p).st_mtime_ns, os.stat(p).st_size, p) for p in self._entries()))
+        size = sum(e[1] for e in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            os.remove(path)
+            size -= entry_size
+
+    def _load_manifest(self):
+        path = os.path.join(self.directory, CACHE_MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as file:
+            return json.load(file)
+
+    def _save_manifest(self):
+        path = os.path.join(self.directory, CACHE_MANIFEST)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(self._manifest, file)
+        os.replace(tmp_path, path)
+
+
+def _hash_file(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_pages(pages):
+    # tables of all pages of the same class (and width) are stacked in a single float64 array;
+    # the pages only keep their class name, table rows, columns, index and metadata
+    records = []
+    tables = {}
+    for page in pages:
+        if isinstance(page, str):
+            continue
+        df = page.df
+        attrs = {k: v for k, v in vars(page).items() if k not in CACHE_SKIPPED_ATTRS}
+        key = '{}-{}'.format(type(page).__name__, len(df.columns))
+        table = tables.setdefault(key, [])
+        start = sum(len(t) for t in table)
+        table.append(df.to_numpy(dtype=np.float64))
+        records.append({'class': type(page).__name__, 'table': key, 'rows': [start, start + len(df)],
+                        'columns': list(df.columns), 'index': _encode_index(df.index), 'attrs': attrs})
+
+    arrays = {key: np.concatenate(t) for key, t in tables.items()}
+    header = json.dumps({'version': CACHE_VERSION, 'pages': records}, default=_encode_json)
+    return header, arrays
+
+
+def _decode_pages(header, arrays):
+    pages = []
+    for record in header['pages']:
+        cls = _page_classes()[record['class']]
+        a, b = record['rows']
+
+        page = cls.__new__(cls)
+        page.__dict__.update(_raw_lines=None, _df=None, span=None)
+        page.__dict__.update(record['attrs'])
+        page.df = pd.DataFrame(arrays[record['table']][a:b], columns=record['columns'],
+                               index=_decode_index(record['index']))
+        pages.append(page)
+    return pages
+
+
+def _page_classes():
+    from nastran.post.f06.flutter import FlutterF06Page
+    from nastran.post.f06.eigval import RealEigValF06Page, ModalEffectiveMassFractionF06Page
+    return {cls.__name__: cls for cls in (FlutterF06Page, RealEigValF06Page, ModalEffectiveMassFractionF06Page)}
+
+
+def _encode_json(value):
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('{} is not cacheable.'.format(type(value).__name__))
+
+
+def _decode_json(obj):
+    if '__date__' in obj:
+        return datetime.date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def _encode_index(index):
+    if isinstance(index, pd.RangeIndex):
+        return {'start': index.start, 'stop': index.stop, 'step': index.step}
+    return index.tolist()
+
+
+def _decode_index(index):
+    if isinstance(index, dict):
+        return pd.RangeIndex(index['start'], index['stop'], index['step'])
+    return pd.Index(index)
@@ -2,10 +2,16 @@ from pandas.core.frame import DataFrame
 
 import pandas as pd
 import numpy as np
+import io
 import re
+import mmap
 import calendar
 import datetime
 import time
+import weakref
+
+from itertools import chain
+from functools import lru_cache
 
 SKIP_LINE_SET = {"*** USER INFORMATION MESSAGE", "A ZERO FREQUENCY"}
 
@@ -15,33 +21,142 @@ re_date = re.compile(r'(?P<month>\w+)\s+(?P<day>\d{1,2}),\s+(?P<year>\d{4})')
 re_version = re.compile(r'(?P<vname>[^\d]*)(?P<vdate>\d{1,2}\/\d{1,2}\/\d{1,2})')
 re_page = re.compile(r'PAGE\s+(?P<page>\d+)$')
 
+MONTHS = list(calendar.month_name)
+
+F06_ENCODING = 'latin-1'
+
+
 class F06Page:
+    """
+    Base of the parsed F06 pages. A page built with a `span` (lazy page) does not keep its
+    raw lines: they are decoded from the memory mapped file on access, and the `df` table
+    is parsed from them only on its first access.
+    """
 
-    def __init__(self, raw_lines=None, meta=None):
-        self.raw_lines = raw_lines
+    def __init__(self, raw_lines=None, meta=None, span=None, header=None):
+        self._raw_lines = raw_lines
+        self._df = None
+        self.span = span
         self.meta = {} if meta == None else meta
-        self.parse_page_metadata_header()
-    
-    def parse_page_metadata_header(self):
-        first_line = self.raw_lines[0]
-        
-        date = re_date.search(first_line)
-        self.meta['run-date'] = datetime.date(
+        self.parse_page_metadata_header(header)
+
+    @property
+    def raw_lines(self):
+        if self._raw_lines is None and self.span is not None:
+            return self.span.read_lines()
+        return self._raw_lines
+
+    @raw_lines.setter
+    def raw_lines(self, raw_lines):
+        self._raw_lines = raw_lines
+
+    @property
+    def df(self):
+        if self._df is None and self.span is not None:
+            self._df = self.parse_df(self.raw_lines)
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+
+    @property
+    def is_loaded(self):
+        return self._df is not None
+
+    def parse_df(self, lines):
+        return None
+
+    def parse_page_metadata_header(self, lines=None):
+        lines = self.raw_lines if lines is None else lines
+        if not lines:  # pages not read from text (e.g. OP2 results)
+            return
+        self.meta.update(decode_page_header(lines[0]))
+
+
+def decode_page_header(line):
+    """
+    Decodes the run date, version and page number of the first line of a page. The run date and
+    version repeat on every page of a run, so they are decoded once and memoized.
+    """
+    page = re_page.search(line)
+    meta = dict(_decode_run_header(line[:page.start()]))
+    meta['page'] = int(page.group('page'))
+    return meta
+
+
+@lru_cache(maxsize=64)
+def _decode_run_header(header):
+    date = re_date.search(header)
+    version = re_version.search(header)
+    return (
+        ('run-date', datetime.date(
             int(date.group('year').strip()),
-            list(calendar.month_name).index(date.group('month').strip().title()),
+            MONTHS.index(date.group('month').strip().title()),
             int(date.group('day').strip())
-        )
-        
-        version = re_version.search(first_line)
-        self.meta['run-version-name'] = version.group('vname').strip()
-        self.meta['run-version-date'] = datetime.date(
+        )),
+        ('run-version-name', version.group('vname').strip()),
+        ('run-version-date', datetime.date(
             *time.strptime(
                 version.group('vdate').strip(),
                 '%m/%d/%y')[:3]
-        )
-        
-        self.meta['page'] = int(re_page.search(first_line).group('page'))
-    
+        )),
+    )
+
+
+class F06MappedFile:
+    """
+    Memory map of a F06 file shared by the spans of its lazy pages, opened on first use.
+    `close` (or the garbage collection of the object) releases the map and the file handle;
+    a closed map is opened again on the next read.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+        self._mm = None
+        self._finalizer = None
+
+    def __getstate__(self):
+        return {'filename': self.filename, '_file': None, '_mm': None, '_finalizer': None}
+
+    @property
+    def closed(self):
+        return self._mm is None
+
+    def read(self, offset, length):
+        if self._mm is None:
+            self._file = open(self.filename, 'rb')
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._finalizer = weakref.finalize(self, _close_mapped_file, self._mm, self._file)
+        return self._mm[offset:offset+length]
+
+    def read_lines(self, offset, length):
+        return _decode_lines(self.read(offset, length))
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+            self._mm, self._file, self._finalizer = None, None, None
+
+
+def _close_mapped_file(mm, file):
+    mm.close()
+    file.close()
+
+
+class F06PageSpan:
+
+    def __init__(self, source: F06MappedFile, offset, length):
+        self.source = source
+        self.offset = offset
+        self.length = length
+
+    def __repr__(self):
+        return 'F06 Page Span [{}:{}] of {}'.format(self.offset, self.offset+self.length, self.source.filename)
+
+    def read_lines(self):
+        return self.source.read_lines(self.offset, self.length)
 
     
 def find_tabular_line_range(lines, shift):
@@ -70,6 +185,29 @@ def extract_tabulated_data(lines):
     return data
 
 
+def extract_tabulated_array(lines, ncols=None):
+    """
+    Parses the whitespace separated table lines straight into a float64 array of shape
+    (len(lines), ncols). Non-numeric tokens become NaN and short rows are padded with NaN.
+    """
+    rows = [line.split() for line in lines]
+    tokens = list(chain.from_iterable(rows))
+    width = max(ncols or 0, max(map(len, rows), default=0))
+
+    try:
+        values = np.fromiter(map(float, tokens), dtype=np.float64, count=len(tokens))
+    except ValueError:
+        values = np.fromiter(map(_parse_float, tokens), dtype=np.float64, count=len(tokens))
+
+    if len(tokens) == width * len(rows) and all(len(r) == width for r in rows):
+        return values.reshape(len(rows), width)
+
+    counts = np.fromiter(map(len, rows), dtype=int, count=len(rows))
+    data = np.full((len(rows), width), np.nan)
+    data[np.arange(width) < counts[:, None]] = values
+    return data
+
+
 def parse_label_subcase(line):
     res = p_header.search(line[1:])
     label = res.group('label').strip()
@@ -86,24 +224,15 @@ def parse_text_value(value):
         except ValueError:
             return value
 
+def _parse_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def _decode_lines(buffer):
+    # same line splitting (universal newlines) of a file opened in text mode
+    return io.StringIO(buffer.decode(F06_ENCODING), newline=None).readlines()
+
 def _check_skip_lines(line):
     return any(map(lambda k: k in line, SKIP_LINE_SET))
-
-# def read_and_concat_f06s(case_files, labels, label_name="THETA"):
-#
-#     if len(labels) != len(case_files):
-#         raise Exception("Collections should be of same size.")
-#
-#     df_results = []
-#
-#     for i, fn in enumerate(case_files):
-#         print("Reading... {}".format(fn))
-#         df_data = read_f06(fn)
-#         df_results.append(
-#             pd.concat(
-#                 { labels[i]: df_data },
-#                 names=[label_name]
-#             )
-#         )
-#
-#     return pd.concat(df_results)
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 
-from nastran.post.f06.common import extract_tabulated_data, parse_text_value, find_tabular_line_range, parse_label_subcase, F06Page
+from nastran.post.f06.common import extract_tabulated_array, parse_text_value, find_tabular_line_range, parse_label_subcase, F06Page
 
 REALIGVAL_SUBCASE_LINE = 2
 REALIGVAL_TABULAR_LINE = 7
@@ -19,34 +19,40 @@ REALIGVAL_KEYS = {
 }
 
 class RealEigValF06Page(F06Page):
-    def __init__(self, df=None, info=None, raw_lines=None, meta=None):
-        super().__init__(raw_lines, meta)
+    def __init__(self, df=None, info=None, raw_lines=None, meta=None, span=None, header=None):
+        super().__init__(raw_lines, meta, span, header)
         self.df = df
         self.info = {} if info == None else info
 
+    def parse_df(self, lines):
+        a, b = find_tabular_line_range(lines, REALIGVAL_TABULAR_LINE)
+
+        if REALEIGVAL_CHECK_AUGMENTATION_STR in lines[REALEIGVAL_CHECK_AUGMENTATION_LINE]:
+            a += 1
+
+        parsed_data = extract_tabulated_array(lines[a:b], len(REALIGVAL_KEYS))
+
+        return pd.DataFrame(parsed_data, columns=list(REALIGVAL_KEYS.keys()))
+
     def __repr__(self):
         return self.__str__()
 
     def __str__(self):
-        return 'REAL EIGVAL F06\tSUBCASE {}\tPAGE {}'.format(self.info['SUBCASE'], self.meta['page'])
+        return 'REAL EIGVAL F06\tSUBCASE {}\tPAGE {}'.format(self.info['SUBCASE'], self.meta.get('page'))
 
-def parse_realeigval_page(lines):
-    
-    a, b = find_tabular_line_range(lines, REALIGVAL_TABULAR_LINE)
-    
-    if REALEIGVAL_CHECK_AUGMENTATION_STR in lines[REALEIGVAL_CHECK_AUGMENTATION_LINE]:
-        a += 1
-     
-    parsed_data = extract_tabulated_data(lines[a:b])
-
-    df = pd.DataFrame(parsed_data, columns=list(REALIGVAL_KEYS.keys()))
+def parse_realeigval_page(lines, span=None):
     
     info = {}
     label, subcase = parse_label_subcase(lines[REALIGVAL_SUBCASE_LINE])
     info['LABEL'] = label
     info['SUBCASE'] = subcase
-    
-    return RealEigValF06Page(df, info, lines)
+
+    if span is not None:
+        return RealEigValF06Page(None, info, span=span, header=lines)
+
+    page = RealEigValF06Page(None, info, lines)
+    page.df = page.parse_df(lines)
+    return page
 
 def summarize_real_eigvals(results, key='CYCLES'):
     vals = list(map(lambda p: (p.info['SUBCASE'], p.df[key]), results.eigval))
@@ -90,17 +96,31 @@ MODALMASSFRAC_ROTATION_KEYS = {
 
 class ModalEffectiveMassFractionF06Page(F06Page):
     
-    def __init__(self, df=None, info=None, continuation=False, rawlines=None, meta=None):
-        super().__init__(rawlines, meta)
+    def __init__(self, df=None, info=None, continuation=False, rawlines=None, meta=None, span=None, header=None):
+        super().__init__(rawlines, meta, span, header)
         self.df = df
         self.info = {} if info == None else info
         self.continuation = continuation
     
     @classmethod
-    def parse_page(cls, lines, is_continuation=False):
+    def parse_page(cls, lines, is_continuation=False, span=None):
+
+        info = {}
+        label, subcase = parse_label_subcase(lines[MODALMASSFRAC_SUBCASE_LINE])
+        info['LABEL'] = label
+        info['SUBCASE'] = subcase
+
+        if span is not None:
+            return cls(None, info, is_continuation, span=span, header=lines)
 
-        if is_continuation:
-            return cls._parse_continuation_page(lines)
+        page = cls(None, info, is_continuation, lines)
+        page.df = page.parse_df(lines)
+        return page
+
+    def parse_df(self, lines):
+
+        if self.continuation:
+            return self._parse_continuation_df(lines)
         
         a, b = find_tabular_line_range(lines, MODALMASSFRAC_TABULAR_LINE)
 
@@ -108,19 +128,11 @@ class ModalEffectiveMassFractionF06Page(F06Page):
         if MODALMASSFRAC_CHECK_TRANSLATION_STR in lines[MODALMASSFRAC_CHECK_TRANSLATION_LINE]:
             mode = MODALMASSFRAC_TRANSLATION_KEYS
 
-        parsed_data = extract_tabulated_data(lines[a:b])
-
-        df = pd.DataFrame(parsed_data, columns=list(mode.keys()))
-
-        info = {}
-        label, subcase = parse_label_subcase(lines[MODALMASSFRAC_SUBCASE_LINE])
-        info['LABEL'] = label
-        info['SUBCASE'] = subcase
+        parsed_data = extract_tabulated_array(lines[a:b], len(mode))
 
-        return ModalEffectiveMassFractionF06Page(df, info, lines)
+        return pd.DataFrame(parsed_data, columns=list(mode.keys()))
     
-    @classmethod
-    def _parse_continuation_page(cls, lines):
+    def _parse_continuation_df(self, lines):
 
         a, b = find_tabular_line_range(lines, 7)
 
@@ -128,16 +140,9 @@ class ModalEffectiveMassFractionF06Page(F06Page):
         if 'T1' in lines[4]:
             mode = MODALMASSFRAC_TRANSLATION_KEYS
 
-        parsed_data = extract_tabulated_data(lines[a:b])
-
-        df = pd.DataFrame(parsed_data, columns=list(mode.keys()))
-
-        info = {}
-        label, subcase = parse_label_subcase(lines[MODALMASSFRAC_SUBCASE_LINE])
-        info['LABEL'] = label
-        info['SUBCASE'] = subcase
+        parsed_data = extract_tabulated_array(lines[a:b], len(mode))
 
-        return ModalEffectiveMassFractionF06Page(df, info, lines, True)
+        return pd.DataFrame(parsed_data, columns=list(mode.keys()))
     
     @classmethod
     def is_page_of_this_type(cls, lines, previous_page_type):
@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from nastran.post.f06.flutter import FlutterResults, FLUTTER_INDEX_KEYS
+
+EXPORT_TABLES = ('flutter', 'eigval', 'modalmassfrac')
+
+# columns of the partitions of each exported table (the rest of its index is stored as columns)
+EXPORT_PARTITIONS = {
+    'flutter': ['SUBCASE', 'MACH NUMBER'],
+    'eigval': ['SUBCASE'],
+    'modalmassfrac': ['SUBCASE'],
+}
+
+EXPORT_INDEX = {
+    'flutter': list(FLUTTER_INDEX_KEYS),
+    'eigval': ['SUBCASE'],
+    'modalmassfrac': ['SUBCASE'],
+}
+
+
+def export_tables(results):
+    """
+    Flat tables of the flutter (in the `flutter_pages_to_df` layout), real eigenvalue and modal
+    effective mass fraction pages of the results, with their index levels as columns.
+    """
+    tables = {}
+    if len(results.flutter) > 0:
+        tables['flutter'] = FlutterResults.from_pages(results.flutter).to_df().reset_index()
+    if len(results.eigval) > 0:
+        tables['eigval'] = _stack_pages(results.eigval)
+    if len(results.modalmassfrac) > 0:
+        # translational and rotational fractions of each mode are joined in the same row
+        df = _stack_pages(results.modalmassfrac)
+        tables['modalmassfrac'] = df.groupby(['SUBCASE', 'MODE'], sort=False).first().reset_index()
+    return tables
+
+
+def write_parquet(results, directory):
+    """
+    Writes each table as a parquet dataset in `directory` (e.g. `directory/flutter`) with
+    hive partitions by SUBCASE (and MACH NUMBER for the flutter table). Requires pyarrow.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, df in export_tables(results).items():
+        df.to_parquet(os.path.join(directory, name), index=False,
+                      partition_cols=EXPORT_PARTITIONS[name],
+                      existing_data_behavior='delete_matching')
+
+
+def write_hdf(results, filename):
+    """
+    Writes each partition of each table as a node of the HDF5 file (e.g.
+    `flutter/SUBCASE_1/MACH_NUMBER_0_8`) in table format. Requires PyTables.
+    """
+    with pd.HDFStore(filename, mode='w') as store:
+        for name, df in export_tables(results).items():
+            keys = EXPORT_PARTITIONS[name]
+            for values, part in df.groupby(keys if len(keys) > 1 else keys[0], sort=False):
+                store.put(_hdf_key(name, keys, values), part.reset_index(drop=True), format='table')
+
+
+def read_exported(path, table='flutter', subcase=None, mach=None):
+    """
+    Reads an exported table from a parquet directory (see `write_parquet`) or a HDF5 file
+    (see `write_hdf`), loading only the partitions of the given subcase and Mach number.
+    """
+    partitions = {'SUBCASE': subcase, 'MACH NUMBER': mach}
+    selected = {k: partitions[k] for k in EXPORT_PARTITIONS[table] if partitions.get(k) is not None}
+
+    if os.path.isdir(path):
+        filters = [(k, '==', v) for k, v in selected.items()] or None
+        df = pd.read_parquet(os.path.join(path, table), filters=filters)
+        for k in EXPORT_PARTITIONS[table]:  # partition columns are read as categories
+            df[k] = df[k].astype(FLUTTER_INDEX_KEYS[k])
+    else:
+        with pd.HDFStore(path, mode='r') as store:
+            parts = [store[key] for key in store.keys() if _match_hdf_key(key, table, selected)]
+        df = pd.concat(parts, ignore_index=True) if len(parts) > 0 else pd.DataFrame()
+
+    if len(df) == 0:
+        return df
+    columns = EXPORT_INDEX[table] + [c for c in df.columns if c not in EXPORT_INDEX[table]]
+    return df[columns].set_index(EXPORT_INDEX[table])
+
+
+def _stack_pages(pages):
+    df = pd.concat([p.df for p in pages], ignore_index=True)
+    df.insert(0, 'SUBCASE', np.repeat([p.info['SUBCASE'] for p in pages], [len(p.df) for p in pages]))
+    return df
+
+
+def _hdf_key(table, keys, values):
+    values = values if isinstance(values, tuple) else (values,)
+    return '/'.join([table] + [_hdf_node(k, v) for k, v in zip(keys, values)])
+
+
+def _hdf_node(key, value):
+    # shortest repr that gives the value back, so close values (e.g. Mach numbers) do not collide
+    value = float(value)
+    text = str(int(value)) if value.is_integer() else repr(value)
+    return '{}_{}'.format(key.replace(' ', '_'), text.replace('.', '_').replace('-', 'm').replace('+', 'p'))
+
+
+def _match_hdf_key(key, table, selected):
+    nodes = key.strip('/').split('/')
+    return nodes[0] == table and all(_hdf_node(k, v) in nodes[1:] for k, v in selected.items())
@@ -1,9 +1,18 @@
+import numpy as np
 import pandas as pd
 
+import time
 import datetime
 
-from nastran.post.f06.flutter import parse_flutter_page, FlutterF06Page
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from nastran.post.f06.flutter import parse_flutter_page, FlutterF06Page, FlutterResults, FLUTTER_INDEX_KEYS
 from nastran.post.f06.eigval import parse_realeigval_page, RealEigValF06Page, summarize_real_eigvals, ModalEffectiveMassFractionF06Page
+from nastran.post.f06.pagetype import _check_page_type, register_page_type, F06PageClassifier
+from nastran.post.f06.cache import F06Cache
+from nastran.post.f06.export import write_parquet, write_hdf, read_exported
+from nastran.post.f06.index import F06PageIndex, load_f06_index
+from nastran.post.f06.common import F06MappedFile, F06PageSpan, _decode_lines
 
 PAGE_PARSING_FUNCTIONS = {
     'flutter': parse_flutter_page,
@@ -13,15 +22,11 @@ PAGE_PARSING_FUNCTIONS = {
     'text': lambda ls: '\n'.join(ls)
 }
 
-FLUTTER_CHECK_LINE = 3
-FLUTTER_CHECK_STR = 'FLUTTER  SUMMARY'
-
-EIGVALSUMMARY_CHECK_LINE = 6
-EIGVALSUMMARY_CHECK_STR = 'E I G E N V A L U E  A N A L Y S I S   S U M M A R Y'
+INDEXED_PAGE_TYPES = (FlutterF06Page, RealEigValF06Page, ModalEffectiveMassFractionF06Page)
 
-REALEIGVAL_CHECK_LINE = 4
-REALEIGVAL_CHECK_STR = 'R E A L   E I G E N V A L U E S'
+PARALLEL_CHUNKS_PER_WORKER = 4
 
+F06_END_OF_JOB_STR = b'* * * END OF JOB * * *'
 
 METADATA_DICT = {
     'TOTAL PAGES: ': lambda res: len(res.pages),
@@ -31,28 +36,120 @@ METADATA_DICT = {
 }
 
 class F06Results:
+    """
+    Parsed pages of a F06 file. The pages are indexed once by type, and the typed ones by
+    subcase (and the flutter ones also by Mach number and POINT), so repeated queries don't
+    scan all pages. Add pages through `add_pages` (or set `pages`) to keep the index.
+    """
 
     def __init__(self, pages=None):
-        self.pages = pages
+        self.pages = pages if pages is not None else []
 
     def __repr__(self):
         return 'F06 Results with {} pages.'.format(len(self.pages))
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory maps of the lazy pages (see `read_f06_pages`). Their tables
+        already parsed are kept; the others map the file again when accessed.
+        """
+        for source in {id(p.span.source): p.span.source for p in self._nottext if p.span is not None}.values():
+            source.close()
+
+    @property
+    def pages(self):
+        return self._pages
+
+    @pages.setter
+    def pages(self, pages):
+        self._pages = []
+        self._by_type = {cls: [] for cls in INDEXED_PAGE_TYPES}
+        self._nottext = []
+        self._by_subcase = {cls: {} for cls in INDEXED_PAGE_TYPES}
+        self._flutter_by_mach = {}
+        self._flutter_by_point = {}
+        self._flutter_by_key = {}
+        self.add_pages(pages)
+
+    def add_pages(self, pages):
+        for page in pages:
+            self._pages.append(page)
+            self._index_page(page)
+
     @property
     def flutter(self):
-        return list(filter(lambda p: isinstance(p, FlutterF06Page), self.pages))
+        return list(self._by_type[FlutterF06Page])
     
     @property
     def eigval(self):
-        return list(filter(lambda p: isinstance(p, RealEigValF06Page), self.pages))
+        return list(self._by_type[RealEigValF06Page])
     
     @property
     def modalmassfrac(self):
-        return list(filter(lambda p: isinstance(p, ModalEffectiveMassFractionF06Page), self.pages))
+        return list(self._by_type[ModalEffectiveMassFractionF06Page])
     
     @property
     def nottext(self):
-        return list(filter(lambda p: not isinstance(p, str), self.pages))
+        return list(self._nottext)
+
+    def get_flutter(self, subcase=None, mach=None, point=None):
+        """
+        Flutter pages of the given subcase, Mach number and/or POINT, in page order.
+        """
+        if subcase is not None and mach is not None and point is not None:
+            return list(self._flutter_by_key.get((subcase, mach, point), []))
+
+        candidates = [d.get(k, []) for d, k in ((self._by_subcase[FlutterF06Page], subcase),
+                                                (self._flutter_by_mach, mach),
+                                                (self._flutter_by_point, point)) if k is not None]
+        if len(candidates) == 0:
+            return self.flutter
+
+        return [p for p in min(candidates, key=len)
+                if (subcase is None or p.info['SUBCASE'] == subcase)
+                and (mach is None or p.info['MACH NUMBER'] == mach)
+                and (point is None or p.info['POINT'] == point)]
+
+    def get_eigval(self, subcase=None):
+        if subcase is None:
+            return self.eigval
+        return list(self._by_subcase[RealEigValF06Page].get(subcase, []))
+
+    def get_modalmassfrac(self, subcase=None):
+        if subcase is None:
+            return self.modalmassfrac
+        return list(self._by_subcase[ModalEffectiveMassFractionF06Page].get(subcase, []))
+
+    @property
+    def subcases(self):
+        return sorted(set().union(*(d.keys() for d in self._by_subcase.values())))
+
+    @property
+    def machs(self):
+        return sorted(self._flutter_by_mach.keys())
+
+    def _index_page(self, page):
+        if isinstance(page, str):
+            return
+        self._nottext.append(page)
+
+        cls = next((c for c in INDEXED_PAGE_TYPES if isinstance(page, c)), None)
+        if cls is None:
+            return
+        self._by_type[cls].append(page)
+        self._by_subcase[cls].setdefault(page.info['SUBCASE'], []).append(page)
+
+        if cls is FlutterF06Page:
+            key = (page.info['SUBCASE'], page.info['MACH NUMBER'], page.info['POINT'])
+            self._flutter_by_mach.setdefault(key[1], []).append(page)
+            self._flutter_by_point.setdefault(key[2], []).append(page)
+            self._flutter_by_key.setdefault(key, []).append(page)
     
     def to_excel(self, filename: str):
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -71,42 +168,256 @@ class F06Results:
             
             # if len(self.flutter) > 0:
                 # summarize_real_eigvals(self.flutter).to_excel(writer, sheet_name='FLUTTER SUMMARY')
+
+    def to_parquet(self, directory: str):
+        """
+        Exports the flutter, eigenvalue and modal mass fraction tables as parquet datasets
+        partitioned by SUBCASE and MACH NUMBER. Read them back with `read_exported`.
+        """
+        write_parquet(self, directory)
+
+    def to_hdf(self, filename: str):
+        """
+        Exports the flutter, eigenvalue and modal mass fraction tables to a HDF5 file, one node
+        per SUBCASE and MACH NUMBER partition. Read them back with `read_exported`.
+        """
+        write_hdf(self, filename)
     
-def read_f06(filename: str):
-    with open(filename, 'r') as file:
-        raw_lines = file.readlines()
+def read_f06(filename: str, workers: int = None, cache: F06Cache = None, lazy: bool = False):
+    """
+    Reads and parses all pages of the F06 file. With `workers` > 1 the pages are parsed
+    in a pool of processes, each one handling a page-aligned byte range of the file.
+    If a `cache` is given, the pages of an already parsed file content are loaded from it
+    (text pages are not cached).
+    With `lazy` the tables of the pages are parsed only when first accessed (see `read_f06_pages`);
+    use the results as a context manager (or call `close`) to release the file.
+    """
+    if cache is not None:
+        pages = cache.get(filename)
+        if pages is not None:
+            return F06Results(pages)
 
-    groups = _group_lines_by_page(raw_lines)
+    if lazy:
+        return read_f06_pages(filename, None, load_f06_index(filename, sidecar=False), lazy=True)
 
-    pages = []
-    T = None
-    for lines in groups:
-        # TODO: Check Page Type and automatically send to function
-        T = _check_page_type(lines, T)
-        pages.append(PAGE_PARSING_FUNCTIONS[T](lines, ))
+    if workers is not None and workers > 1:
+        pages = _parse_pages_in_parallel(filename, workers)
+    else:
+        pages = list(iter_f06_pages(filename))
 
+    if cache is not None:
+        cache.put(filename, pages)
     return F06Results(pages)
 
 
-def _check_page_type(lines, previous_page_type=None):
-    if len(lines)-1 >= FLUTTER_CHECK_LINE and FLUTTER_CHECK_STR in lines[FLUTTER_CHECK_LINE]:
-        return 'flutter'
-    elif len(lines)-1 >= EIGVALSUMMARY_CHECK_LINE and EIGVALSUMMARY_CHECK_STR in lines[EIGVALSUMMARY_CHECK_LINE]:
-        return 'text' # TODO: add support for the eigenval summary data
-    elif len(lines)-1 >= REALEIGVAL_CHECK_LINE and REALEIGVAL_CHECK_STR in lines[REALEIGVAL_CHECK_LINE]:
-        return 'realeigval'
-    elif ModalEffectiveMassFractionF06Page.is_page_of_this_type(lines, previous_page_type):
-        return 'ModalEffectiveMassFractionF06Page'
+def read_f06_batch(paths, labels, label_name: str = 'THETA', workers: int = None):
+    """
+    Reads the flutter results of many F06 files (e.g. of a ply angle sweep) into a single
+    DataFrame in the `flutter_pages_to_df` layout with an extra outer index level `label_name`
+    holding the label of each file. With `workers` > 1 the files are parsed in a pool of processes.
+
+    A file that fails to be read is reported and left out of the DataFrame. The failures are
+    kept in `df.attrs['failures']` as a {path: error} dict.
+    """
+    if len(labels) != len(paths):
+        raise ValueError("Collections should be of same size.")
+
+    stores = [None]*len(paths)
+    failures = {}
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_read_flutter_results, path): i for i, path in enumerate(paths)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    stores[i] = future.result()
+                except Exception as e:
+                    failures[paths[i]] = e
     else:
-        return 'text'
+        for i, path in enumerate(paths):
+            try:
+                stores[i] = _read_flutter_results(path)
+            except Exception as e:
+                failures[paths[i]] = e
+
+    for path, e in failures.items():
+        print("WARNING: Failed to read {}: {}".format(path, e))
+
+    df = _concat_flutter_results([s for s in stores if s is not None],
+                                 [label for label, s in zip(labels, stores) if s is not None],
+                                 label_name)
+    df.attrs['failures'] = failures
+    return df
+
+
+def _read_flutter_results(filename):
+    pages = read_f06_pages(filename, ('flutter',), load_f06_index(filename, sidecar=False)).flutter
+    return FlutterResults.from_pages(pages)
+
+
+def _concat_flutter_results(stores, labels, label_name):
+    # the rows of all files are copied once into preallocated arrays
+    sizes = [len(s) for s in stores]
+    bounds = np.cumsum([0] + sizes)
+    columns = FlutterResults().columns
+    data = np.empty((bounds[-1], len(columns)))
+    keys = {key: np.empty(bounds[-1], dtype=dtype) for key, dtype in FLUTTER_INDEX_KEYS.items()}
+    for store, a, b in zip(stores, bounds[:-1], bounds[1:]):
+        for j, column in enumerate(columns):
+            data[a:b, j] = store.column(column)
+        for key, values in keys.items():
+            values[a:b] = store.column(key)
+
+    index = pd.MultiIndex.from_arrays([pd.Index(labels).repeat(sizes)] + list(keys.values()),
+                                      names=[label_name] + list(FLUTTER_INDEX_KEYS.keys()))
+    return pd.DataFrame(data, index=index, columns=columns, copy=False)
+
+
+def iter_f06_pages(filename: str):
+    """
+    Reads the F06 file incrementally and yields each parsed page as soon as it is complete.
+    Only one page of raw lines is held in memory at a time.
+    """
+    with open(filename, 'r') as file:
+        T = None
+        for lines in _iter_lines_by_page(file):
+            T = _check_page_type(lines, T)
+            yield PAGE_PARSING_FUNCTIONS[T](lines, )
+
+
+class F06Follower:
+    """
+    Incremental reader of a F06 file still being written (e.g. a running SOL 145 job).
+    Each `poll` parses only the pages completed since the last one and appends them
+    to `results`, so its cost depends on the new bytes, not on the file size.
+    """
+
+    def __init__(self, filename: str, results: F06Results = None):
+        self.filename = filename
+        self.results = results if results is not None else F06Results([])
+        self.offset = 0  # byte offset of the first page not parsed yet
+        self.page_type = None  # type of the last parsed page
+        self.finished = False
+
+    def __repr__(self):
+        return 'F06 Follower of {} at byte {}.'.format(self.filename, self.offset)
+
+    def poll(self):
+        """
+        Parses the pages completed since the last poll and returns them.
+        """
+        with open(self.filename, 'rb') as file:
+            file.seek(self.offset)
+            buffer = file.read()
+
+        self.finished = F06_END_OF_JOB_STR in buffer
+
+        # a page is complete once the next one starts
+        end = buffer.rfind(b'\n1')
+        if end == -1:
+            return []
+
+        # the first char of the next page closes the last complete one
+        lines = _decode_lines(buffer[:end+2])
+
+        pages = []
+        for lines in _iter_lines_by_page(lines):
+            self.page_type = _check_page_type(lines, self.page_type)
+            pages.append(PAGE_PARSING_FUNCTIONS[self.page_type](lines, ))
+
+        self.offset += end + 1
+        self.results.add_pages(pages)
+        return pages
+
+    def follow(self, interval: float = 10.0):
+        """
+        Polls the file every `interval` seconds, yielding the new pages of each poll,
+        until the end of the job is written.
+        """
+        while True:
+            pages = self.poll()
+            if len(pages) > 0:
+                yield pages
+            if self.finished:
+                break
+            time.sleep(interval)
+
+
+def read_f06_pages(filename: str, page_types=('flutter',), index: F06PageIndex = None, lazy: bool = False):
+    """
+    Reads only the pages of the given types (e.g. 'flutter', 'realeigval') using the page index
+    of the file, so the remaining pages are neither scanned nor decoded.
+
+    With `lazy`, only the page headers are decoded: the pages keep their byte span in a memory
+    map of the file (instead of their raw lines) and parse their table on the first access to `df`.
+    The map stays open until `close` is called on the results (or they are used as a context
+    manager). Text pages are plain strings, so they are still decoded up front: pass only the
+    tabular `page_types` to skip them.
+    """
+    index = load_f06_index(filename) if index is None else index
+    if not lazy:
+        return F06Results([PAGE_PARSING_FUNCTIONS[entry.type](lines, ) for entry, lines in index.iter_lines(page_types)])
+
+    source = F06MappedFile(filename)
+    pages = []
+    for entry, lines in index.iter_lines(page_types, header_only=True):
+        if entry.type == 'text':
+            pages.append(PAGE_PARSING_FUNCTIONS['text'](source.read_lines(entry.offset, entry.length)))
+        else:
+            span = F06PageSpan(source, entry.offset, entry.length)
+            pages.append(PAGE_PARSING_FUNCTIONS[entry.type](lines, span=span))
+    return F06Results(pages)
+
+
+def _parse_pages_in_parallel(filename, workers):
+    # page types are detected sequentially by the index, so continuation pages are kept right
+    index = load_f06_index(filename, sidecar=False)
+    chunks = _split_entries(index.entries, workers * PARALLEL_CHUNKS_PER_WORKER)
+
+    pages = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_pages in executor.map(_parse_page_chunk, [filename]*len(chunks), chunks):
+            pages.extend(chunk_pages)
+    return pages
+
+
+def _split_entries(entries, n):
+    # contiguous groups of pages with about the same amount of bytes
+    if len(entries) == 0:
+        return []
+    size = (entries[-1].offset + entries[-1].length - entries[0].offset) / n
+    chunks = [[]]
+    for entry in entries:
+        if len(chunks[-1]) > 0 and entry.offset - chunks[-1][0].offset >= size:
+            chunks.append([])
+        chunks[-1].append(entry)
+    return chunks
+
+
+def _parse_page_chunk(filename, entries):
+    start = entries[0].offset
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        buffer = file.read(entries[-1].offset + entries[-1].length - start)
+
+    pages = []
+    for entry in entries:
+        a = entry.offset - start
+        lines = _decode_lines(buffer[a:a+entry.length])
+        pages.append(PAGE_PARSING_FUNCTIONS[entry.type](lines, ))
+    return pages
 
 
 def _group_lines_by_page(lines):
-    groups = []
+    return list(_iter_lines_by_page(lines))
+
+
+def _iter_lines_by_page(lines):
+    # a page is complete only when the next one starts (first char of the line is '1'),
+    # so the trailing group (i.e. the END OF JOB page) is never yielded
     group = []
-    for i, line in enumerate(lines):
+    for line in lines:
         if line[0] == '1' and len(group) > 0:
-            groups.append(group)
+            yield group
             group = []
         group.append(line)
-    return groups
@@ -4,7 +4,7 @@ from copy import copy
 
 from pandas.core.frame import DataFrame
 
-from nastran.post.f06.common import extract_tabulated_data, parse_text_value, find_tabular_line_range, parse_label_subcase, F06Page
+from nastran.post.f06.common import extract_tabulated_array, parse_text_value, find_tabular_line_range, parse_label_subcase, F06Page
 
 import numpy as np
 import pandas as pd
@@ -37,17 +37,27 @@ FLUTTER_DATA_KEYS = {
     'IMAGEIGVAL': 'Imag Eigenvalue',
 }
 
-
+FLUTTER_INDEX_KEYS = {
+    'SUBCASE': np.int64,
+    'MACH NUMBER': np.float64,
+    'POINT': np.int64,
+    'INDEX': np.int64,
+}
 
 p_info = {key:re.compile(r'\b{} =\s*\S*'.format(key)) for key in FLUTTER_INFO_KEYS}
 
 
 class FlutterF06Page(F06Page):
-    def __init__(self, df=None, info=None, raw_lines=None, meta=None):
-        super().__init__(raw_lines, meta)
+    def __init__(self, df=None, info=None, raw_lines=None, meta=None, span=None, header=None):
+        super().__init__(raw_lines, meta, span, header)
         self.df = df
         self.info = {} if info == None else info
 
+    def parse_df(self, lines):
+        a, b = find_tabular_line_range(lines, FLUTTER_SUMMARY_TABULAR_LINE)
+        parsed_data = extract_tabulated_array(lines[a:b], len(FLUTTER_DATA_KEYS))
+        return pd.DataFrame(parsed_data, columns=list(FLUTTER_DATA_KEYS.keys()))
+
     def __repr__(self):
         return self.__str__()
 
@@ -57,37 +67,131 @@ class FlutterF06Page(F06Page):
                                                            self.info['POINT'])
 
 
+class FlutterResults:
+    """
+    Columnar store of flutter summary rows. The data columns (KFREQ, VELOCITY, DAMPING, ...)
+    and the key columns (SUBCASE, MACH NUMBER, POINT, INDEX) are preallocated NumPy arrays
+    grown by doubling, so appending pages is amortized O(n) and `to_df` does not copy the data.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.columns = list(FLUTTER_DATA_KEYS.keys())
+        self._size = 0
+        self._last_key = None
+        self._last_index = -1
+        self._data = np.empty((len(self.columns), capacity))
+        self._keys = {key: np.empty(capacity, dtype=dtype) for key, dtype in FLUTTER_INDEX_KEYS.items()}
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return 'Flutter Results with {} rows.'.format(self._size)
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    def column(self, key):
+        """
+        View of the first rows of a data or key column.
+        """
+        if key in self._keys:
+            return self._keys[key][:self._size]
+        return self._data[self.columns.index(key), :self._size]
+
+    def append(self, data, subcase, mach, point, index=None):
+        """
+        Appends the rows of a (n, ncols) array. If no `index` is given, rows of the same
+        (SUBCASE, MACH NUMBER, POINT) of the last appended ones continue its INDEX count,
+        which joins continuation pages on the fly.
+        """
+        data = np.asarray(data, dtype=np.float64)
+        n = len(data)
+        key = (subcase, mach, point)
+
+        if index is None:
+            start = self._last_index + 1 if key == self._last_key else 0
+            index = np.arange(start, start + n)
+
+        self._reserve(self._size + n)
+        a, b = self._size, self._size + n
+        self._data[:, a:b] = data.T
+        self._keys['SUBCASE'][a:b] = subcase
+        self._keys['MACH NUMBER'][a:b] = mach
+        self._keys['POINT'][a:b] = point
+        self._keys['INDEX'][a:b] = index
+
+        self._size = b
+        if n > 0:
+            self._last_key = key
+            self._last_index = self._keys['INDEX'][b-1]
+
+    def append_page(self, page, keep_index=False):
+        self.append(page.df[self.columns].to_numpy(),
+                    page.info['SUBCASE'],
+                    page.info['MACH NUMBER'],
+                    page.info['POINT'],
+                    page.df.index if keep_index else None)
+
+    def to_df(self):
+        """
+        Materializes the rows in the `flutter_pages_to_df` layout. The DataFrame is built over
+        views of the stored columns.
+        """
+        index = pd.MultiIndex.from_arrays([self.column(key) for key in FLUTTER_INDEX_KEYS],
+                                          names=list(FLUTTER_INDEX_KEYS.keys()))
+        return pd.DataFrame(self._data[:, :self._size].T, index=index, columns=self.columns, copy=False)
+
+    @classmethod
+    def from_pages(cls, pages, keep_index=False):
+        res = cls(capacity=max(sum(len(p.df) for p in pages), 1))
+        for page in pages:
+            res.append_page(page, keep_index)
+        return res
+
+    def _reserve(self, size):
+        if size <= self.capacity:
+            return
+        capacity = max(size, 2*self.capacity)
+        data = np.empty((len(self.columns), capacity))
+        data[:, :self._size] = self._data[:, :self._size]
+        self._data = data
+        for key, column in self._keys.items():
+            self._keys[key] = np.empty(capacity, dtype=column.dtype)
+            self._keys[key][:self._size] = column[:self._size]
+
+
 def join_flutter_pages(pages):
     new_pages = []
-    last_idx = 0
+    groups = []
 
     for i, page in enumerate(pages):
         if _is_continuation(i, pages):
-            # count = range(last_idx_number+1,last_idx_number+1+len(df))
-            page.df.index = range(last_idx+1,last_idx+1+len(page.df))
-            # last_idx = page.df.index.stop - 1
-            new_pages[-1].df = pd.concat([new_pages[-1].df, page.df])
+            groups[-1].append(page.df)
         else:
-            # page.df.index = create_multiindex()
             new_pages.append(copy(page))
-        last_idx = page.df.index.stop - 1
+            groups.append([page.df])
+
+    # a single concat per mode, the continuation rows keep counting the INDEX
+    for page, dfs in zip(new_pages, groups):
+        if len(dfs) > 1:
+            page.df = pd.concat(dfs, ignore_index=True)
 
     return new_pages
 
 
 def flutter_pages_to_df(pages):
-    data = []
-
-    for page in pages:
-        df = copy(page.df)
-        # idx = range(df.index.start, df.index.stop, df.index.step)
-        df.index = _create_multiindex(page.info, df.index)
-        data.append(df)
+    return FlutterResults.from_pages(pages, keep_index=True).to_df()
 
-    return pd.concat(data)
 
-
-def parse_flutter_page(lines):
+def parse_flutter_page(lines, span=None):
+    """
+    Parses a flutter summary page. If the page `span` is given, `lines` may be only the page
+    header and the table is parsed on the first access to `df`.
+    """
 
     raw_info = [lines[i] for i in FLUTTER_SUMMARY_INFO_LINES]
     info = _parse_summary_info(raw_info)
@@ -96,12 +200,12 @@ def parse_flutter_page(lines):
     info['LABEL'] = label
     info['SUBCASE'] = subcase
 
-    a, b = find_tabular_line_range(lines, FLUTTER_SUMMARY_TABULAR_LINE)
-    parsed_data = extract_tabulated_data(lines[a:b])
-
-    df = pd.DataFrame(parsed_data, columns=list(FLUTTER_DATA_KEYS.keys()))
+    if span is not None:
+        return FlutterF06Page(None, info, span=span, header=lines)
 
-    return FlutterF06Page(df, info, lines)
+    page = FlutterF06Page(None, info, lines)
+    page.df = page.parse_df(lines)
+    return page
 
 
 def calc_sawyer_dyn_pressure(vel, mach, D, vref, a, rho):
@@ -138,55 +242,83 @@ def interpolate_df(df, x_col, x):
     new_df.columns = df.columns
     return new_df
 
-def get_critical_roots(df, epsilon=1e-9, var_ref="DAMPING"):
-
-    indexes = list(df.index.names)
-    for label in ["INDEX", "POINT"]:
-        indexes.remove(label)
+def find_damping_crossings(df, epsilon=1e-9, var_ref="DAMPING", direction=1):
+    """
+    Finds every crossing of `var_ref` through zero along the INDEX of each mode, for all
+    subcases, Mach numbers (and any other index level) at once, and interpolates linearly
+    every column at `var_ref` = 0.
+
+    direction : 1 for the flutter onsets (negative to non-negative), -1 for the modes getting
+        stable again and 0 for both.
+
+    Returns a DataFrame with the same columns, indexed by the levels of `df` except INDEX plus
+    a CROSSING level counting the crossings of each mode by increasing INDEX.
+    """
+    levels = [name for name in df.index.names if name != 'INDEX']
+
+    mode_ids, _ = pd.factorize(df.index.droplevel('INDEX'))
+    order = np.lexsort((df.index.get_level_values('INDEX'), mode_ids))
+    mode_ids = mode_ids[order]
+
+    data = df.to_numpy(dtype=np.float64)[order]
+    ref = data[:, df.columns.get_loc(var_ref)]
+    # a NaN damping is neither stable nor unstable, so no crossing starts or ends at it
+    stable = ref < -epsilon
+    unstable = ref >= -epsilon
+
+    same_mode = mode_ids[1:] == mode_ids[:-1]
+    onset = stable[:-1] & unstable[1:]
+    recover = unstable[:-1] & stable[1:]
+    if direction > 0:
+        crossing = same_mode & onset
+    elif direction < 0:
+        crossing = same_mode & recover
+    else:
+        crossing = same_mode & (onset | recover)
+    lower = np.flatnonzero(crossing)
+    upper = lower + 1
+
+    # linear interpolation of all columns at var_ref = 0.0
+    y0, y1 = data[lower], data[upper]
+    t = (0.0 - ref[lower]) / (ref[upper] - ref[lower])
+    values = y0 + t[:, None] * (y1 - y0)
+    values[:, df.columns.get_loc(var_ref)] = 0.0
+
+    # crossings counted by mode (lower is sorted by mode)
+    first = np.r_[True, mode_ids[lower][1:] != mode_ids[lower][:-1]]
+    starts = np.flatnonzero(first)
+    counts = np.diff(np.r_[starts, len(lower)])
+    crossing_number = np.arange(len(lower)) - np.repeat(starts, counts)
+
+    rows = order[lower]
+    index = pd.MultiIndex.from_arrays(
+        [df.index.get_level_values(name)[rows] for name in levels] + [crossing_number],
+        names=levels + ['CROSSING'])
+
+    return pd.DataFrame(values, index=index, columns=df.columns)
 
-    critic_idx = df.loc[df[var_ref] >= -epsilon, 'VELOCITY'].groupby(indexes).apply(lambda df: df.idxmin())
 
-    critic_modes_idx = critic_idx.apply(lambda i: i[:-1])
-
-    # critic = [df_.loc[idx] for idx in points.to_list()]
-
-    interp_data = []
-
-    for idx in critic_modes_idx.to_list():
-
-        df_s = df.loc[idx]
-
-        positive_damp_idx = df_s[var_ref] >= -epsilon
-        if not any(positive_damp_idx):
-            continue
-
-        # first row after flutter (damp >= 0)
-        upper_row = df_s.loc[positive_damp_idx].iloc[0,:]
-
-        # row before the flutter condition
-        if upper_row.name > 0:
-            lower_row = df_s.loc[upper_row.name-1,:]
-        else:
-            print("WARNING: Can't interpolate. Mode already in flutter")
-            continue
-
-        # new row interpolated for var_ref = 0.0
-        dft = pd.DataFrame([lower_row, upper_row])
-        new_row = interpolate_df(dft, var_ref, 0.0)
-
-        # create a new DataFrame
-        multi_idx = pd.MultiIndex.from_tuples([idx], names=df.index.names[:-1])
-        new_row.index = multi_idx
+def get_critical_roots(df, epsilon=1e-9, var_ref="DAMPING"):
+    """
+    Critical root (lowest velocity flutter onset) of each subcase and Mach number (and any other
+    index level besides POINT and INDEX), interpolated at `var_ref` = 0.
+    """
+    _warn_modes_already_in_flutter(df, epsilon, var_ref)
 
-        interp_data.append(new_row)
+    roots = find_damping_crossings(df, epsilon, var_ref, direction=1)
+    roots = roots.droplevel('CROSSING')
 
-    if len(interp_data) == 0:
+    if len(roots) == 0:
         print("WARNING: No critial roots were found... check epsilon value or analysis parameters.")
         return pd.DataFrame([])
-    return pd.concat(interp_data)
-
 
+    # lowest velocity onset of each group
+    groups = roots.index.droplevel('POINT')
+    group_ids, _ = pd.factorize(groups)
+    order = np.lexsort((roots['VELOCITY'].to_numpy(), group_ids))
+    first = np.r_[True, group_ids[order][1:] != group_ids[order][:-1]]
 
+    return roots.iloc[order[first]]
 
 
 def _parse_summary_info(lines):
@@ -203,6 +335,16 @@ def _parse_summary_info(lines):
 
     return info
 
+def _warn_modes_already_in_flutter(df, epsilon, var_ref):
+    first_rows = df.loc[df.index.get_level_values('INDEX') == df.index.get_level_values('INDEX').min()]
+    in_flutter = first_rows.index[first_rows[var_ref].to_numpy() >= -epsilon].droplevel('INDEX').unique()
+    if len(in_flutter) > 0:
+        modes = ['; '.join('{} {}'.format(k, v) for k, v in mode.items())
+                 for mode in in_flutter.to_frame(index=False).to_dict('records')]
+        print("WARNING: Modes already in flutter at the first velocity, their onset is not "
+              "interpolated (the other roots are still reported): {}".format(', '.join(modes)))
+
+
 def _is_continuation(i, pages):
 
     is_continuation = False
@@ -0,0 +1,168 @@
+import os
+import json
+import mmap
+
+from collections import namedtuple
+
+from nastran.post.f06.common import parse_label_subcase, re_page, _decode_lines
+from nastran.post.f06.pagetype import _check_page_type
+
+INDEX_SIDECAR_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+# lines decoded per page to detect its type and subcase (the page body is never decoded)
+INDEX_HEADER_LINES = 11
+INDEX_SUBCASE_LINE = 2
+
+F06PageEntry = namedtuple('F06PageEntry', ['offset', 'length', 'page', 'type', 'subcase'])
+
+
+class F06PageIndex:
+    """
+    Byte offset index of the pages of a F06 file, built over a memory map of the file.
+    Each entry holds the offset and length of the page, the page number, the page type
+    (as detected by `_check_page_type`) and the subcase.
+    """
+
+    def __init__(self, filename, entries=None, size=None, mtime=None):
+        self.filename = filename
+        self.entries = entries if entries is not None else []
+        self.size = size
+        self.mtime = mtime
+
+    def __repr__(self):
+        return 'F06 Page Index with {} pages.'.format(len(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def filter(self, page_types):
+        if isinstance(page_types, str):
+            page_types = (page_types,)
+        return [e for e in self.entries if e.type in page_types]
+
+    def iter_lines(self, page_types=None, header_only=False):
+        """
+        Yields (entry, lines) of the selected pages, decoding only their byte spans
+        (or only the header lines of each page).
+        """
+        entries = self.entries if page_types is None else self.filter(page_types)
+        if len(entries) == 0:
+            return
+        with open(self.filename, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for entry in entries:
+                    end = entry.offset + entry.length
+                    if header_only:
+                        end = _header_end(mm, entry.offset, end)
+                    yield entry, _decode_lines(mm[entry.offset:end])
+
+    def is_up_to_date(self):
+        stat = os.stat(self.filename)
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime)
+
+    @property
+    def sidecar_filename(self):
+        return self.filename + INDEX_SIDECAR_SUFFIX
+
+    def save(self, filename=None):
+        filename = self.sidecar_filename if filename is None else filename
+        data = {
+            'version': INDEX_VERSION,
+            'size': self.size,
+            'mtime': self.mtime,
+            'entries': [list(e) for e in self.entries],
+        }
+        with open(filename, 'w') as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, filename, index_filename=None):
+        """
+        Loads the sidecar index of the F06 file. Returns None if it does not exist or is
+        out of date with the F06 file.
+        """
+        index_filename = filename + INDEX_SIDECAR_SUFFIX if index_filename is None else index_filename
+        if not os.path.exists(index_filename):
+            return None
+        with open(index_filename, 'r') as file:
+            data = json.load(file)
+        if data.get('version') != INDEX_VERSION:
+            return None
+        index = cls(filename, [F06PageEntry(*e) for e in data['entries']], data['size'], data['mtime'])
+        return index if index.is_up_to_date() else None
+
+    @classmethod
+    def build(cls, filename):
+        stat = os.stat(filename)
+        entries = []
+        if stat.st_size > 0:
+            with open(filename, 'rb') as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    entries = _index_pages(mm, _find_page_offsets(mm))
+        return cls(filename, entries, stat.st_size, stat.st_mtime_ns)
+
+
+def load_f06_index(filename, sidecar=True):
+    """
+    Returns the page index of the F06 file, from its sidecar file when it is up to date.
+    Otherwise the index is built and, if `sidecar` is set, saved next to the F06 file.
+    """
+    index = F06PageIndex.load(filename) if sidecar else None
+    if index is None:
+        index = F06PageIndex.build(filename)
+        if sidecar:
+            try:
+                index.save()
+            except OSError:
+                print("WARNING: Can't save the page index of {}".format(filename))
+    return index
+
+
+def _find_page_offsets(mm, start=0, end=None):
+    # same rule of `_group_lines_by_page`: a page starts at a line whose first char is '1'
+    end = len(mm) if end is None else end
+    offsets = [start]
+    pos = mm.find(b'\n1', start, end)
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = mm.find(b'\n1', pos + 1, end)
+    return offsets
+
+
+def _index_pages(mm, offsets, previous_page_type=None):
+    # the last offset opens an incomplete page, which is not indexed
+    entries = []
+    T = previous_page_type
+    for a, b in zip(offsets[:-1], offsets[1:]):
+        lines = _decode_lines(mm[a:_header_end(mm, a, b)])
+        T = _check_page_type(lines, T)
+        entries.append(F06PageEntry(a, b - a, _parse_page_number(lines), T, _parse_subcase(lines, T)))
+    return entries
+
+
+def _header_end(mm, start, end):
+    pos = start
+    for _ in range(INDEX_HEADER_LINES):
+        pos = mm.find(b'\n', pos, end)
+        if pos == -1:
+            return end
+        pos += 1
+    return pos
+
+
+def _parse_page_number(lines):
+    res = re_page.search(lines[0])
+    return int(res.group('page')) if res else None
+
+
+def _parse_subcase(lines, page_type):
+    if page_type == 'text' or len(lines) <= INDEX_SUBCASE_LINE:
+        return None
+    try:
+        return parse_label_subcase(lines[INDEX_SUBCASE_LINE])[1]
+    except AttributeError:
+        return None
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from nastran.post.f06.f06 import F06Results, read_f06, read_f06_pages
+from nastran.post.f06.eigval import (RealEigValF06Page, ModalEffectiveMassFractionF06Page, REALIGVAL_KEYS,
+                                     MODALMASSFRAC_TRANSLATION_KEYS, MODALMASSFRAC_ROTATION_KEYS)
+
+OP2_MODALMASSFRAC_MATRIX = 'EFMFACS'
+
+RESULTS_FORMATS = ('f06', 'op2')
+
+
+def read_results(filename: str, fmt: str = None, **kwargs):
+    """
+    Reads the results of the file in the given format ('f06' or 'op2'), which defaults to the
+    file extension. The keyword arguments are passed to `read_f06` or `read_op2`.
+    """
+    fmt = os.path.splitext(filename)[1][1:].lower() if fmt is None else fmt.lower()
+    if fmt == 'op2':
+        return read_op2(filename, **kwargs)
+    if fmt not in RESULTS_FORMATS:
+        print("WARNING: Unknown results format '{}', reading {} as F06".format(fmt, filename))
+    return read_f06(filename, **kwargs)
+
+
+def read_op2(filename: str, f06_filename: str = None):
+    """
+    Reads the real eigenvalues and modal effective mass fractions of the OP2 file into the
+    same pages and tables of `read_f06`, with no text to float conversion.
+
+    pyNastran does not read the flutter summary (OVG table) of OP2 files, so the flutter
+    pages are read from the F06 file of the same job (`f06_filename`, by default the OP2 file
+    with the .f06 extension) when it exists, decoding only those pages.
+    """
+    # the OP2 reader of pyNastran is slow to import, so F06 only users don't pay for it
+    from pyNastran.op2.op2 import OP2
+
+    op2 = OP2(debug=False)
+    op2.read_op2(filename)
+    results = parse_op2_results(op2)
+
+    f06_filename = os.path.splitext(filename)[0] + '.f06' if f06_filename is None else f06_filename
+    if os.path.exists(f06_filename):
+        results.add_pages(read_f06_pages(f06_filename, ('flutter',)).pages)
+    else:
+        print("WARNING: No F06 file found for the flutter results of {}".format(filename))
+    return results
+
+
+def parse_op2_results(op2):
+    """
+    Builds the F06 pages of the real eigenvalues and modal effective mass fractions of an
+    already read pyNastran OP2 model.
+    """
+    subcases = _eigenvector_subcases(op2)
+    pages = []
+    for i, (title, eigvals) in enumerate(op2.eigenvalues.items()):
+        if not hasattr(eigvals, 'generalized_stiffness'):  # complex or buckling eigenvalues
+            continue
+        label, subcase = subcases.get(title, (title, i + 1))
+        pages.append(RealEigValF06Page(_realeigval_df(eigvals), {'LABEL': label, 'SUBCASE': subcase}))
+
+    if OP2_MODALMASSFRAC_MATRIX in op2.matrices:
+        info = dict(pages[0].info) if len(pages) > 0 else {'LABEL': '', 'SUBCASE': 1}
+        cycles = pages[0].df.CYCLES.to_numpy() if len(pages) > 0 else None
+        fractions = _matrix_to_array(op2.matrices[OP2_MODALMASSFRAC_MATRIX].data)
+        pages.append(ModalEffectiveMassFractionF06Page(
+            _modalmassfrac_df(fractions[:3], cycles, MODALMASSFRAC_TRANSLATION_KEYS), dict(info)))
+        pages.append(ModalEffectiveMassFractionF06Page(
+            _modalmassfrac_df(fractions[3:], cycles, MODALMASSFRAC_ROTATION_KEYS), dict(info)))
+
+    return F06Results(pages)
+
+
+def _eigenvector_subcases(op2):
+    # the eigenvalue tables are keyed by the case title, the eigenvectors have the subcase
+    subcases = {}
+    for key, vectors in op2.eigenvectors.items():
+        subcase = getattr(vectors, 'isubcase', key)
+        subcases.setdefault(vectors.title, (vectors.label, subcase))
+    return subcases
+
+
+def _realeigval_df(eigvals):
+    data = np.column_stack([
+        eigvals.mode,
+        eigvals.extraction_order,
+        eigvals.eigenvalues,
+        eigvals.radians,
+        eigvals.cycles,
+        eigvals.generalized_mass,
+        eigvals.generalized_stiffness,
+    ]).astype(np.float64)
+    return pd.DataFrame(data, columns=list(REALIGVAL_KEYS.keys()))
+
+
+def _modalmassfrac_df(fractions, cycles, keys):
+    nmodes = fractions.shape[1]
+    data = np.empty((nmodes, len(keys)))
+    data[:, 0] = np.arange(1, nmodes + 1)
+    data[:, 1] = np.nan if cycles is None or len(cycles) < nmodes else cycles[:nmodes]
+    data[:, 2::2] = fractions.T
+    data[:, 3::2] = np.cumsum(fractions, axis=1).T
+    return pd.DataFrame(data, columns=list(keys.keys()))
+
+
+def _matrix_to_array(data):
+    if hasattr(data, 'toarray'):  # sparse matrices
+        data = data.toarray()
+    return np.asarray(data, dtype=np.float64)
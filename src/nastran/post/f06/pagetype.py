@@ -0,0 +1,76 @@
+import re
+
+from nastran.post.f06.eigval import ModalEffectiveMassFractionF06Page
+
+FLUTTER_CHECK_LINE = 3
+FLUTTER_CHECK_STR = 'FLUTTER  SUMMARY'
+
+EIGVALSUMMARY_CHECK_LINE = 6
+EIGVALSUMMARY_CHECK_STR = 'E I G E N V A L U E  A N A L Y S I S   S U M M A R Y'
+
+REALEIGVAL_CHECK_LINE = 4
+REALEIGVAL_CHECK_STR = 'R E A L   E I G E N V A L U E S'
+
+DEFAULT_PAGE_TYPE = 'text'
+
+
+class F06PageClassifier:
+    """
+    Registry of page types of the F06 file. A page type is detected either by a marker string
+    at a fixed line of the page or by a `check(lines, previous_page_type)` function. The markers
+    of each line are compiled into a single regex, so each header line is scanned once no matter
+    how many types are registered. Types are tried in the order they were registered.
+    """
+
+    def __init__(self, default=DEFAULT_PAGE_TYPE):
+        self.default = default
+        self._rules = []
+        self._patterns = None
+
+    def __repr__(self):
+        return 'F06 Page Classifier with {} page types.'.format(len(self._rules))
+
+    def register(self, page_type, line=None, marker=None, check=None):
+        if check is None and (line is None or marker is None):
+            raise ValueError('A page type needs a line and a marker or a check function.')
+        self._rules.append((page_type, line, marker, check))
+        self._patterns = None
+
+    def classify(self, lines, previous_page_type=None):
+        if self._patterns is None:
+            self._compile()
+
+        matches = set()
+        for i, pattern in self._patterns:
+            if i < len(lines):
+                matches.update(m.lastgroup for m in pattern.finditer(lines[i]))
+
+        for k, (page_type, _, _, check) in enumerate(self._rules):
+            if check is None:
+                if 'r{}'.format(k) in matches:
+                    return page_type
+            elif check(lines, previous_page_type):
+                return page_type
+        return self.default
+
+    def _compile(self):
+        markers = {}
+        for k, (_, line, marker, check) in enumerate(self._rules):
+            if check is None:
+                markers.setdefault(line, []).append('(?P<r{}>{})'.format(k, re.escape(marker)))
+        self._patterns = [(i, re.compile('|'.join(m))) for i, m in sorted(markers.items())]
+
+
+PAGE_CLASSIFIER = F06PageClassifier()
+PAGE_CLASSIFIER.register('flutter', FLUTTER_CHECK_LINE, FLUTTER_CHECK_STR)
+PAGE_CLASSIFIER.register('text', EIGVALSUMMARY_CHECK_LINE, EIGVALSUMMARY_CHECK_STR)  # TODO: add support for the eigenval summary data
+PAGE_CLASSIFIER.register('realeigval', REALEIGVAL_CHECK_LINE, REALEIGVAL_CHECK_STR)
+PAGE_CLASSIFIER.register('ModalEffectiveMassFractionF06Page', check=ModalEffectiveMassFractionF06Page.is_page_of_this_type)
+
+
+def register_page_type(page_type, line=None, marker=None, check=None):
+    PAGE_CLASSIFIER.register(page_type, line, marker, check)
+
+
+def _check_page_type(lines, previous_page_type=None):
+    return PAGE_CLASSIFIER.classify(lines, previous_page_type)
@@ -0,0 +1,202 @@
+import os
+import shutil
+import tempfile
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from nastran.post.f06.f06 import read_f06
+from nastran.post.f06.flutter import FlutterResults, get_critical_roots
+
+# MSC/NX NASTRAN runs in background by default, `batch=no` makes the call wait for the job
+NASTRAN_ARGS = ('{deck}', 'batch=no', 'scr=yes', 'old=no', 'news=no')
+
+OUTPUT_SUFFIXES = ('.f06', '.op2')
+
+F06_FATAL_STR = '*** USER FATAL MESSAGE'
+
+
+class NastranJob:
+    """
+    A deck queued in a `NastranRunner`. Once finished, `status` is 'done' or 'failed' and
+    `outputs` maps the captured output suffixes ('.f06', '.op2') to their filenames.
+    """
+
+    def __init__(self, bdf, name=None):
+        self.bdf = bdf
+        self.name = name if name is not None else os.path.splitext(os.path.basename(bdf))[0]
+        self.status = 'queued'
+        self.workdir = None
+        self.returncode = None
+        self.outputs = {}
+        self.results = None
+        self.flutter = None
+        self.roots = None
+        self.error = None
+
+    def __repr__(self):
+        return 'NASTRAN Job {} ({}).'.format(self.name, self.status)
+
+    @property
+    def f06(self):
+        return self.outputs.get('.f06')
+
+    @property
+    def op2(self):
+        return self.outputs.get('.op2')
+
+
+class ExternalSolver:
+    """
+    Runs the solver executable on the deck in the job directory. `args` are formatted
+    with the deck filename (`{deck}`) and the job name (`{name}`).
+    """
+
+    def __init__(self, executable='nastran', args=NASTRAN_ARGS):
+        self.executable = executable
+        self.args = args
+
+    def __repr__(self):
+        return 'External Solver {}.'.format(self.executable)
+
+    def __call__(self, deck, workdir, timeout=None):
+        name = os.path.splitext(os.path.basename(deck))[0]
+        command = [self.executable] + [arg.format(deck=os.path.basename(deck), name=name) for arg in self.args]
+        with open(os.path.join(workdir, name + '.log'), 'w') as log:
+            process = subprocess.run(command, cwd=workdir, stdout=log, stderr=subprocess.STDOUT, timeout=timeout)
+        return process.returncode
+
+
+class StubSolver:
+    """
+    Replays canned outputs (e.g. a F06 file of a previous run) as the outputs of every deck,
+    to run the scheduler without a NASTRAN license.
+    """
+
+    def __init__(self, f06_filename, op2_filename=None, returncode=0):
+        self.outputs = {'.f06': f06_filename, '.op2': op2_filename}
+        self.returncode = returncode
+
+    def __repr__(self):
+        return 'Stub Solver replaying {}.'.format(self.outputs['.f06'])
+
+    def __call__(self, deck, workdir, timeout=None):
+        name = os.path.splitext(os.path.basename(deck))[0]
+        for suffix, filename in self.outputs.items():
+            if filename is not None:
+                shutil.copyfile(filename, os.path.join(workdir, name + suffix))
+        return self.returncode
+
+
+class NastranRunner:
+    """
+    Runs the queued decks with a bounded pool of `workers` solver processes. Each job runs
+    in its own scratch directory under `scratch` (default: a temporary directory, removed after
+    the run unless `keep_scratch`); its outputs are copied to `output_dir` (default: the
+    directory of the deck) and, unless `keep_scratch`, the scratch directory is removed. The F06 of each job is read and its critical roots found as soon as it finishes.
+
+    `solver` is any callable (deck, workdir, timeout) -> return code, see `ExternalSolver`
+    and `StubSolver`.
+    """
+
+    def __init__(self, solver=None, workers=None, scratch=None, output_dir=None, keep_scratch=False, timeout=None):
+        self.solver = solver if solver is not None else ExternalSolver()
+        self.workers = workers if workers is not None else 1
+        self.scratch = scratch
+        self.output_dir = output_dir
+        self.keep_scratch = keep_scratch
+        self.timeout = timeout
+        self.jobs = []
+
+    def __repr__(self):
+        return 'NASTRAN Runner with {} jobs and {} workers.'.format(len(self.jobs), self.workers)
+
+    def submit(self, bdf, name=None):
+        job = NastranJob(bdf, name)
+        if any(j.name == job.name for j in self.jobs):
+            raise ValueError('Job {} already submitted.'.format(job.name))
+        self.jobs.append(job)
+        return job
+
+    def submit_cases(self, cases, column='bdf'):
+        """
+        Submits the decks of a cases DataFrame (see `PanelFlutterSweep.write`).
+        """
+        return [self.submit(bdf) for bdf in cases[column]]
+
+    def iter_completed(self):
+        """
+        Runs the queued jobs, yielding each one as it finishes.
+        """
+        queued = [job for job in self.jobs if job.status == 'queued']
+        if len(queued) == 0:
+            return
+        scratch = self.scratch if self.scratch is not None else tempfile.mkdtemp(prefix='nastran-')
+        os.makedirs(scratch, exist_ok=True)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self._run_job, job, scratch) for job in queued]
+                for future in as_completed(futures):
+                    job = future.result()
+                    if job.status == 'failed':
+                        print("WARNING: Job {} failed: {}".format(job.name, job.error))
+                    yield job
+        finally:
+            if self.scratch is None and not self.keep_scratch:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+    def run(self):
+        return list(self.iter_completed())
+
+    def critical_roots(self, label_name='JOB'):
+        """
+        Critical roots of all finished jobs in a single DataFrame with an extra outer
+        index level `label_name` holding the job name.
+        """
+        roots = {job.name: job.roots for job in self.jobs if job.roots is not None and len(job.roots) > 0}
+        if len(roots) == 0:
+            return pd.DataFrame([])
+        return pd.concat(roots, names=[label_name])
+
+    def _run_job(self, job, scratch):
+        job.status = 'running'
+        job.workdir = os.path.join(scratch, job.name)
+        try:
+            os.makedirs(job.workdir, exist_ok=True)
+            deck = shutil.copy(job.bdf, os.path.join(job.workdir, job.name + '.bdf'))
+            job.returncode = self.solver(deck, job.workdir, self.timeout)
+            self._capture_outputs(job)
+            if job.returncode != 0:
+                raise RuntimeError('solver returned {}'.format(job.returncode))
+            _read_job_results(job)
+            job.status = 'done'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = e
+        finally:
+            if not self.keep_scratch:
+                shutil.rmtree(job.workdir, ignore_errors=True)
+        return job
+
+    def _capture_outputs(self, job):
+        output_dir = self.output_dir if self.output_dir is not None else os.path.dirname(os.path.abspath(job.bdf))
+        os.makedirs(output_dir, exist_ok=True)
+        for suffix in OUTPUT_SUFFIXES:
+            filename = os.path.join(job.workdir, job.name + suffix)
+            if os.path.exists(filename):
+                job.outputs[suffix] = shutil.copy(filename, os.path.join(output_dir, job.name + suffix))
+
+
+def _read_job_results(job):
+    if job.f06 is None:
+        raise FileNotFoundError('no F06 output')
+    job.results = read_f06(job.f06)
+    fatal = [p for p in job.results.pages if isinstance(p, str) and F06_FATAL_STR in p]
+    if len(fatal) > 0:
+        raise RuntimeError('fatal message in {}'.format(job.f06))
+    if len(job.results.flutter) > 0:
+        job.flutter = FlutterResults.from_pages(job.results.flutter).to_df()
+        job.roots = get_critical_roots(job.flutter)
@@ -6,6 +6,8 @@ from pyNastran.bdf.cards.materials import MAT8, MAT5, MAT2
 
 from nastran.structures.material import OrthotropicMaterial
 
+import numpy as np
+
 class Sheet:
 
     def __init__(self, mat: OrthotropicMaterial, thick: float, theta=0.0) -> None:
@@ -35,6 +37,24 @@ class Ply:
     def N(self):
         return len(self.sheets)
 
+    @property
+    def thickness(self) -> float:
+        return sum(self.thicknesses)
+
+    @property
+    def areal_density(self) -> float:
+        return sum(s.mat.rho * s.thick for s in self.sheets)
+
+    @property
+    def D(self):
+        """
+        Bending stiffness matrix (3x3) of the classical laminate theory. The sheets are stacked
+        bottom to top (as in the PCOMP card) and their angles measured from the x axis of the laminate.
+        """
+        z = np.cumsum([0.] + self.thicknesses) - self.thickness/2
+        Qs = transformed_stiffness(np.array([s.mat.Q for s in self.sheets]), np.array(self.thetas))
+        return np.einsum('k,kij->ij', (z[1:]**3 - z[:-1]**3)/3, Qs)
+
     def get_mat(self, mid):
         return next(filter(lambda s: s.mat.mid == mid, self.sheets)).mat
 
@@ -55,6 +75,24 @@ class Ply:
         return Ply(pid, [Sheet(mat, thick, angle) for angle in thetas])
 
 
+def transformed_stiffness(Q, theta):
+    """
+    Plane stress stiffness matrices (n, 3, 3) rotated by the angles `theta` (n,) in degrees.
+    """
+    t = np.radians(theta)
+    m, n = np.cos(t), np.sin(t)
+    Q11, Q12, Q22, Q66 = Q[:, 0, 0], Q[:, 0, 1], Q[:, 1, 1], Q[:, 2, 2]
+
+    Qb = np.empty((len(t), 3, 3))
+    Qb[:, 0, 0] = Q11*m**4 + 2*(Q12 + 2*Q66)*m**2*n**2 + Q22*n**4
+    Qb[:, 1, 1] = Q11*n**4 + 2*(Q12 + 2*Q66)*m**2*n**2 + Q22*m**4
+    Qb[:, 0, 1] = Qb[:, 1, 0] = (Q11 + Q22 - 4*Q66)*m**2*n**2 + Q12*(m**4 + n**4)
+    Qb[:, 2, 2] = (Q11 + Q22 - 2*Q12 - 2*Q66)*m**2*n**2 + Q66*(m**4 + n**4)
+    Qb[:, 0, 2] = Qb[:, 2, 0] = (Q11 - Q12 - 2*Q66)*m**3*n + (Q12 - Q22 + 2*Q66)*m*n**3
+    Qb[:, 1, 2] = Qb[:, 2, 1] = (Q11 - Q12 - 2*Q66)*m*n**3 + (Q12 - Q22 + 2*Q66)*m**3*n
+    return Qb
+
+
 def parse_ply_config(pid, mat, thick, ply_config):
     sheets = []
     lists = re.findall(r'\[(.*?)\]', ply_config)
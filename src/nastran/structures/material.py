@@ -1,6 +1,8 @@
 
 from pyNastran.bdf.cards.materials import MAT8, MAT5, MAT2, MAT1
 
+import numpy as np
+
 class IsotropicMaterial:
     
     def __init__(self, mid, E, nu, G, rho, alpha=None) -> None:
@@ -13,6 +15,17 @@ class IsotropicMaterial:
 
     def to_mat1(self) -> MAT1:
         return MAT1(self.mid, self.E, self.G, self.nu, rho=self.rho, a=self.alpha)
+
+    @property
+    def Q(self):
+        """
+        Plane stress stiffness matrix (3x3).
+        """
+        G = self.G if self.G is not None else self.E / (2*(1 + self.nu))
+        c = self.E / (1 - self.nu**2)
+        return np.array([[c, self.nu*c, 0.],
+                         [self.nu*c, c, 0.],
+                         [0., 0., G]])
     
 
 class OrthotropicMaterial:
@@ -29,6 +42,17 @@ class OrthotropicMaterial:
 
     def to_mat8(self) -> MAT8:
         return MAT8(self.mid, self.E1, self.E2, self.nu12, g12=self.G12, rho=self.rho, a1=self.alpha1, a2=self.alpha2)
+
+    @property
+    def Q(self):
+        """
+        Plane stress stiffness matrix (3x3) in the material axes.
+        """
+        nu21 = self.nu12 * self.E2 / self.E1
+        c = 1 - self.nu12*nu21
+        return np.array([[self.E1/c, self.nu12*self.E2/c, 0.],
+                         [self.nu12*self.E2/c, self.E2/c, 0.],
+                         [0., 0., self.G12]])
     
     # def to_mat5(self) -> MAT5:
         # return MAT5(self.mid, self.alpha1, self.alpha2)
\ No newline at end of file
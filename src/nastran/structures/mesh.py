@@ -0,0 +1,138 @@
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.cards.nodes import GRID
+from pyNastran.bdf.cards.elements.shell import CQUAD4
+from pyNastran.bdf.field_writer_8 import print_field_8
+from pyNastran.bdf.field_writer_16 import print_field_16
+
+from nastran.utils import check_new_ids
+from nastran.bdf_writer import format_grids
+
+import numpy as np
+
+
+class PlateMesh:
+    """
+    Array-backed mesh of CQUAD4 elements: node ids, (n, 3) node coordinates, element ids and
+    (m, 4) element connectivity (node ids). It takes a few dozen bytes per element, against the
+    pyNastran GRID and CQUAD4 objects of a BDF, which are built only by `to_bdf`.
+    """
+
+    def __init__(self, nids, xyz, eids, elements, pid, theta_mcid=0.0):
+        self.nids = np.asarray(nids, dtype=np.int64)
+        self.xyz = np.asarray(xyz, dtype=np.float64)
+        self.eids = np.asarray(eids, dtype=np.int64)
+        self.elements = np.asarray(elements, dtype=np.int64)
+        self.pid = pid
+        self.theta_mcid = theta_mcid
+
+    def __repr__(self):
+        return 'Plate Mesh with {} nodes and {} elements.'.format(self.nnodes, self.nelements)
+
+    @property
+    def nnodes(self):
+        return len(self.nids)
+
+    @property
+    def nelements(self):
+        return len(self.eids)
+
+    @property
+    def nbytes(self):
+        return self.nids.nbytes + self.xyz.nbytes + self.eids.nbytes + self.elements.nbytes
+
+    def get_xyz(self, nids):
+        """
+        Coordinates of the given node ids.
+        """
+        order = np.argsort(self.nids)
+        return self.xyz[order[np.searchsorted(self.nids, nids, sorter=order)]]
+
+    def to_bdf(self, bdf: BDF = None) -> BDF:
+        """
+        Adds the GRID and CQUAD4 cards of the mesh to the BDF (a new one by default).
+        """
+        bdf = BDF() if bdf is None else bdf
+        add_grids(bdf, self.nids, self.xyz)
+        add_cquad4s(bdf, self.eids, self.pid, self.elements, self.theta_mcid)
+        return bdf
+
+    def write_bulk(self, file, size=8):
+        """
+        Writes the GRID and CQUAD4 cards (small or large field, as written by `BDF.write_bdf`) in
+        id order to an open text file, with no BDF objects.
+        """
+        order = np.argsort(self.nids, kind='stable')
+        file.write(format_grids(self.nids[order].tolist(), self.xyz[order], size))
+
+        theta = _theta_mcid_field(self.theta_mcid, size)
+        order = np.argsort(self.eids, kind='stable')
+        if size == 8:
+            card = 'CQUAD4  %8d%8d%8d%8d%8d%8d' + theta + '\n'
+        else:
+            card = 'CQUAD4* %16d%16d%16d%16d\n*       %16d%16d' + theta + ' '*16 + '\n'
+        file.write(''.join([card % (eid, self.pid, *nodes)
+                            for eid, nodes in zip(self.eids[order].tolist(), self.elements[order].tolist())]))
+
+    @classmethod
+    def structured(cls, p1, d12, d14, nchord, nspan, pid, first_nid=1, first_eid=1, theta_mcid=0.0):
+        """
+        Structured mesh of the parallelogram with origin `p1` and sides `d12` and `d14`.
+        """
+        nids = first_nid + np.arange((nchord+1)*(nspan+1))
+        eids = first_eid + np.arange(nchord*nspan)
+        return cls(nids, structured_grid(p1, d12, d14, nchord, nspan),
+                   eids, structured_quads(nchord, nspan, first_nid), pid, theta_mcid)
+
+
+def structured_grid(p1, d12, d14, nchord, nspan):
+    """
+    Coordinates (as a ((nchord+1)*(nspan+1), 3) array) of the nodes of a structured mesh of the
+    parallelogram with origin `p1` and sides `d12` (chordwise) and `d14` (spanwise). The nodes
+    are numbered spanwise first.
+    """
+    i, j = np.meshgrid(np.arange(nchord+1), np.arange(nspan+1), indexing='ij')
+    i = i.reshape(-1, 1)
+    j = j.reshape(-1, 1)
+    return p1 + d12*i/nchord + d14*j/nspan
+
+
+def structured_quads(nchord, nspan, first_nid=1):
+    """
+    Node ids (as a (nchord*nspan, 4) array) of the quadrilateral elements of the structured
+    mesh of `structured_grid`.
+    """
+    i, j = np.meshgrid(np.arange(nchord), np.arange(nspan), indexing='ij')
+    g1 = (first_nid + i + j + i*nspan).ravel()
+    g2 = g1 + 1
+    g3 = g2 + nspan + 1
+    g4 = g1 + nspan + 1
+    return np.column_stack([g1, g2, g3, g4])
+
+
+def add_grids(bdf: BDF, nids, xyz, cp=0, cd=0):
+    """
+    Adds the GRID cards of all nodes at once, skipping the per card checks of `BDF.add_grid`.
+    """
+    nids = np.asarray(nids).tolist()
+    check_new_ids(bdf.nodes, nids, 'GRID')
+    bdf.nodes.update((nid, GRID(nid, x, cp=cp, cd=cd)) for nid, x in zip(nids, xyz))
+    bdf._type_to_id_map['GRID'].extend(nids)
+
+
+def add_cquad4s(bdf: BDF, eids, pid, nids, theta_mcid=0.0):
+    """
+    Adds the CQUAD4 cards of all elements (`nids` as a (n, 4) array) at once, skipping the
+    per card checks of `BDF.add_cquad4`.
+    """
+    eids = np.asarray(eids).tolist()
+    check_new_ids(bdf.elements, eids, 'CQUAD4')
+    bdf.elements.update((eid, CQUAD4(eid, pid, n, theta_mcid=theta_mcid))
+                        for eid, n in zip(eids, np.asarray(nids).tolist()))
+    bdf._type_to_id_map['CQUAD4'].extend(eids)
+
+
+def _theta_mcid_field(theta_mcid, size=8):
+    # same blank defaults of CQUAD4.write_card, trailing blank fields are stripped (small field)
+    if size == 8:
+        return '' if theta_mcid == 0 else print_field_8(theta_mcid)
+    return ' '*16 if theta_mcid == 0 else print_field_16(theta_mcid)
@@ -5,6 +5,7 @@ from pyNastran.bdf.bdf import BDF
 from nastran.geometry.panels import RectangularPlate
 from nastran.structures.composite import Ply, OrthotropicMaterial, Sheet
 from pyNastran.bdf.cards.properties.shell import PSHELL
+from nastran.structures.mesh import PlateMesh
 from nastran.utils import IdUtility
 
 import numpy as np
@@ -14,7 +15,8 @@ class StructuralPlate(RectangularPlate):
 
     def __init__(self, p1, p2, p3, p4, nspan, nchord, pid, firstNid=1, firstEid=1) -> None:
         super().__init__(p1, p2, p3, p4)
-        self.bdf = BDF()
+        self._bdf = None
+        self.mesh = None
         self.nspan = nspan
         self.nchord = nchord
         self.pid = pid
@@ -24,6 +26,19 @@ class StructuralPlate(RectangularPlate):
     def __repr__(self) -> str:
         return self.bdf.get_bdf_stats()
 
+    @property
+    def bdf(self) -> BDF:
+        # built from the mesh arrays on first access
+        if self._bdf is None:
+            self._bdf = BDF()
+            if self.mesh is not None:
+                self._write_mesh_to_bdf(self._bdf)
+        return self._bdf
+
+    @bdf.setter
+    def bdf(self, bdf) -> None:
+        self._bdf = bdf
+
     def limit_nodes(self, mode="a"): 
         if mode == "a":
             return [
@@ -78,37 +93,43 @@ class StructuralPlate(RectangularPlate):
         self.nspan = nspan
         self.nchord = nchord
 
-    def _generate_material(self) -> None:
+    def _generate_material(self, bdf: BDF) -> None:
         pass
 
-    def _generate_property(self) -> None:
+    def _generate_property(self, bdf: BDF) -> None:
         pass
 
-    def _generate_grid(self):
-        counter = 0
-        for i in range(self.nchord+1):
-            for j in range(self.nspan+1):
-                xyz = self.p1 + self.d12*i/self.nchord + self.d14*j/self.nspan
-                self.bdf.add_grid(self.firstNid + counter, xyz)
-                counter += 1
-
-    def _generate_elements(self):
-        counter = 0
-        for i in range(self.nchord):
-            for j in range(self.nspan):
-                g1 = self.firstNid + i + j + i*self.nspan
-                g2 = g1 + 1
-                g3 = g2 + self.nspan + 1
-                g4 = g1 + self.nspan + 1
-                self.bdf.add_cquad4(self.firstEid + counter, self.pid, [g1, g2, g3, g4], theta_mcid=90.0)
-                counter += 1
-
     def generate_mesh(self) -> BDF:
-        self._generate_material()
-        self._generate_property()
-        self._generate_grid()
-        self._generate_elements()
-        
+        self.mesh = PlateMesh.structured(self.p1, self.d12, self.d14, self.nchord, self.nspan, self.pid,
+                                         self.firstNid, self.firstEid, theta_mcid=90.0)
+        if self._bdf is not None:
+            self._write_mesh_to_bdf(self._bdf)
+
+    def write_bulk(self, file, size=8) -> None:
+        """
+        Writes the GRID and CQUAD4 cards of the mesh to an open file without building the BDF.
+        """
+        self.mesh.write_bulk(file, size)
+
+    def to_bdf(self, mesh_cards=True) -> BDF:
+        """
+        New BDF with the material and property cards of the plate and, with `mesh_cards`, the GRID
+        and CQUAD4 cards of the mesh. Without them, the mesh is written from its arrays by
+        `write_bdf` (e.g. as one of the `meshes` of an `AnalysisModel`).
+        """
+        bdf = BDF()
+        if mesh_cards:
+            self._write_mesh_to_bdf(bdf)
+        else:
+            self._generate_material(bdf)
+            self._generate_property(bdf)
+        return bdf
+
+    def _write_mesh_to_bdf(self, bdf: BDF) -> None:
+        self._generate_material(bdf)
+        self._generate_property(bdf)
+        self.mesh.to_bdf(bdf)
+
 
 class IsotropicPlate(StructuralPlate):
     
@@ -117,11 +138,19 @@ class IsotropicPlate(StructuralPlate):
         self.prop = prop
         self.mat = mat
 
-    def _generate_material(self) -> None:
-        self.bdf._add_structural_material_object(self.mat.to_mat1())
+    def _generate_material(self, bdf: BDF) -> None:
+        bdf._add_structural_material_object(self.mat.to_mat1())
         
-    def _generate_property(self) -> None:
-        self.bdf.properties[self.pid] = self.prop
+    def _generate_property(self, bdf: BDF) -> None:
+        bdf.properties[self.pid] = self.prop
+
+    @property
+    def D(self):
+        return self.mat.Q * self.prop.t**3 / 12
+
+    @property
+    def areal_density(self) -> float:
+        return self.mat.rho * self.prop.t
 
     @classmethod
     def create_plate(cls, p1, p2, p3, p4, nspan, nchord, pid, thick, mat):
@@ -136,16 +165,24 @@ class LaminatedStructuralPlate(StructuralPlate):
         super().__init__(p1, p2, p3, p4, nspan, nchord, ply.pid, **args)
         self.ply = ply
     
-    def _generate_material(self) -> None:
+    def _generate_material(self, bdf: BDF) -> None:
         mids = list(set(self.ply.mids)) # unique
         for mid in mids:
             mat = self.ply.get_mat(mid)
-            self.bdf._add_structural_material_object(mat.to_mat8())
+            bdf._add_structural_material_object(mat.to_mat8())
             # if mat.alpha1 or mat.alpha2:
-                # self.bdf._add_thermal_material_object(mat.to_mat5())
+                # bdf._add_thermal_material_object(mat.to_mat5())
+
+    def _generate_property(self, bdf: BDF) -> None:
+        bdf.properties[self.pid] = self.ply.to_pcomp()
 
-    def _generate_property(self) -> None:
-        self.bdf.properties[self.pid] = self.ply.to_pcomp()
+    @property
+    def D(self):
+        return self.ply.D
+
+    @property
+    def areal_density(self) -> float:
+        return self.ply.areal_density
 
     @classmethod
     def create_sawyer_plate(cls, p1, p2, p3, p4, nspan, nchord, pid, theta, nplies, thick, mat):
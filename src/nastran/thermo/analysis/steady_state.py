@@ -2,6 +2,7 @@
 from typing import Dict
 from pyNastran.bdf.bdf import BDF, CaseControlDeck
 from nastran.aero.superpanels import SuperAeroPanel5
+from nastran.aero.cards import add_cord2rs
 
 from nastran.analysis import AnalysisModel, Subcase
 
@@ -54,24 +55,7 @@ class SteadyStateThermoAnalysisModel(AnalysisModel):
             cc.add_parameter_to_local_subcase(1+i, 'NLPARM = %d' % (10+i))
 
     def write_cord2r_cards(self, superpanel: SuperAeroPanel5):
-        cords = []
-
-        for panel in superpanel.aeropanels.values():
-            # set origin to element mid chord (linear spline requires the Y axis to be colinear with the
-            # "elastic axis" of the structure, since it is a plate chord-wise divided,
-            # the elastic axis should be at mid chord)
-            origin = panel.p1 + panel.d12 / 2
-
-            # point in the XZ plane to define the coordinate system
-            # this hardcodes the Y axis of the local aerodynamic coordinate system
-            # to be colinear with the element Y axis (i.e. the vector of p1 to p4)
-            pxz_i = origin + panel.d12
-
-            # local aerodynamic coordinate system
-            cords.append(
-                self.model.add_cord2r(self.idutil.get_next_coord_id(),
-                                      origin,
-                                      origin + panel.normal,
-                                      pxz_i)
-                        )
-        return cords
+        # local aerodynamic coordinate system of each strip
+        n = superpanel.nchord
+        cids = self.idutil.reserve_ids('coord', n) + np.arange(n)
+        return add_cord2rs(self.model, cids, *superpanel.strip_coordinate_systems())
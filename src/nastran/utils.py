@@ -1,87 +1,173 @@
+from itertools import islice
+
 
 def set_object_properties(obj, data_dict):
     for key, val in data_dict.items():
         setattr(obj, key, val)
 
-def _get_last_id_from_ids(elements):
-    return elements[-1] if elements else 0
+
+def check_new_ids(cards, ids, card_type):
+    if len(cards) > 0 and not cards.keys().isdisjoint(ids):
+        raise ValueError('{} ids already in the model.'.format(card_type))
+
+# cards dict of the BDF of each id family
+ID_FAMILIES = {
+    'element': lambda model: model.elements,
+    'node': lambda model: model.nodes,
+    'caero': lambda model: model.caeros,
+    'flfact': lambda model: model.flfacts,
+    'flutter': lambda model: model.flutters,
+    'method': lambda model: model.methods,
+    'aefact': lambda model: model.aefacts,
+    'paero': lambda model: model.paeros,
+    'spline': lambda model: model.splines,
+    'set': lambda model: model.sets,
+    'coord': lambda model: model.coords,
+    'sid': lambda model: model.spcs,
+}
+
+# ids of the mesh arrays of each id family
+MESH_ID_FAMILIES = {
+    'element': lambda mesh: mesh.eids,
+    'node': lambda mesh: mesh.nids,
+}
 
 class IdUtility:
     """
-        This class is a utility to work with IDs in the BDF format using pyNastran
+        This class is a utility to work with IDs in the BDF format using pyNastran.
+
+        The max id of each family (see ID_FAMILIES) is kept and updated only with the cards
+        added to the model since the last query (whoever added them), so getting the next id
+        is O(1) amortized. Blocks of ids can be reserved with `reserve_ids`, the ids after
+        the block are given next. The node and element ids of the `meshes` written apart from
+        the model (see `AnalysisModel.meshes`) are also taken.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, meshes=None):
         self.model = model
+        self.meshes = meshes if meshes is not None else []
+        self._max_ids = {}  # family: (cards, count, last key, last card, max id)
+        self._mesh_max_ids = {}  # (family, id(mesh)): (ids, max id)
+        self._reserved = {}
+
+    def get_last_id(self, family):
+        return max(self._get_max_id(family), self._get_mesh_max_id(family), self._reserved.get(family, 0))
+
+    def get_next_id(self, family):
+        return self.get_last_id(family) + 1
+
+    def reserve_ids(self, family, n):
+        """
+        Reserves a block of `n` contiguous ids of the family and returns the first one.
+        """
+        first = self.get_next_id(family)
+        self._reserved[family] = first + n - 1
+        return first
+
+    def _get_max_id(self, family):
+        cards = ID_FAMILIES[family](self.model)
+        count = len(cards)
+        if count == 0:
+            return 0
+
+        state = self._max_ids.get(family)
+        if state is not None and state[0] is cards and count >= state[1]:
+            # the cards added since the last query are the last ones of the dict, unless cards
+            # were removed: then the last card of the last query is not right before them
+            tail = list(islice(reversed(cards.keys()), count - state[1] + 1))
+            if tail[-1] == state[2] and cards[state[2]] is state[3]:
+                max_id = max([state[4]] + tail[:-1])
+                self._max_ids[family] = (cards, count, tail[0], cards[tail[0]], max_id)
+                return max_id
+
+        # first query, or cards were removed
+        max_id = max(cards.keys())
+        last = next(reversed(cards.keys()))
+        self._max_ids[family] = (cards, count, last, cards[last], max_id)
+        return max_id
+
+    def _get_mesh_max_id(self, family):
+        ids = MESH_ID_FAMILIES.get(family)
+        if ids is None:
+            return 0
+        return max((self._get_max_mesh_id(family, ids(mesh), id(mesh)) for mesh in self.meshes), default=0)
+
+    def _get_max_mesh_id(self, family, ids, key):
+        # computed once per ids array of the mesh
+        state = self._mesh_max_ids.get((family, key))
+        if state is None or state[0] is not ids:
+            state = (ids, int(ids.max()) if len(ids) > 0 else 0)
+            self._mesh_max_ids[(family, key)] = state
+        return state[1]
 
     def get_last_element_id(self):
-        return _get_last_id_from_ids(list(self.model.element_ids))
+        return self.get_last_id('element')
 
     def get_next_element_id(self):
         return self.get_last_element_id() + 1
 
     def get_last_caero_id(self):
-        return _get_last_id_from_ids(list(self.model.caeros.keys()))
+        return self.get_last_id('caero')
 
     def get_next_caero_id(self):
         return self.get_last_caero_id() + 1
 
     def get_last_node_id(self):
-        return _get_last_id_from_ids(list(self.model.node_ids))
+        return self.get_last_id('node')
 
     def get_next_node_id(self):
         return self.get_last_node_id() + 1
 
     def get_last_flfact_id(self):
-        return _get_last_id_from_ids(list(self.model.flfacts.keys()))
+        return self.get_last_id('flfact')
 
     def get_next_flfact_id(self):
         return self.get_last_flfact_id() + 1
 
     def get_last_flutter_id(self):
-        return _get_last_id_from_ids(list(self.model.flutters.keys()))
+        return self.get_last_id('flutter')
 
     def get_next_flutter_id(self):
         return self.get_last_flutter_id() + 1
 
     def get_last_method_id(self):
-        return _get_last_id_from_ids(list(self.model.methods.keys()))
+        return self.get_last_id('method')
 
     def get_next_method_id(self):
         return self.get_last_method_id() + 1
 
     def get_last_aefact_id(self):
-        return _get_last_id_from_ids(list(self.model.aefacts.keys()))
+        return self.get_last_id('aefact')
 
     def get_next_aefact_id(self):
         return self.get_last_aefact_id() + 1
 
     def get_last_paero_id(self):
-        return _get_last_id_from_ids(list(self.model.paeros.keys()))
+        return self.get_last_id('paero')
 
     def get_next_paero_id(self):
         return self.get_last_paero_id() + 1
 
     def get_last_spline_id(self):
-        return _get_last_id_from_ids(list(self.model.splines.keys()))
+        return self.get_last_id('spline')
 
     def get_next_spline_id(self):
         return self.get_last_spline_id() + 1
 
     def get_last_set_id(self):
-        return _get_last_id_from_ids(list(self.model.sets.keys()))
+        return self.get_last_id('set')
 
     def get_next_set_id(self):
         return self.get_last_set_id() + 1
 
     def get_last_coord_id(self):
-        return _get_last_id_from_ids(list(self.model.coords.keys()))
+        return self.get_last_id('coord')
 
     def get_next_coord_id(self):
         return self.get_last_coord_id() + 1
     
     def get_last_sid(self):
-        return _get_last_id_from_ids(list(self.model.spcs.keys()))
+        return self.get_last_id('sid')
 
     def get_next_sid(self):
         return self.get_last_sid() + 1
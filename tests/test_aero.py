@@ -0,0 +1,223 @@
+import io
+import pytest
+import numpy as np
+import pandas as pd
+
+from pyNastran.bdf.cards.properties.shell import PSHELL
+
+from nastran.structures.material import OrthotropicMaterial, IsotropicMaterial
+from nastran.structures.composite import Ply
+from nastran.structures.panel import IsotropicPlate, LaminatedStructuralPlate
+from nastran.aero.analysis.piston import PistonPanelFlutterSolver
+from nastran.aero.analysis.eigen import FlutterGrid, solve_flutter_grid
+from nastran.aero.analysis.adaptive import refine_flutter_onset
+from nastran.aero.superpanels import SuperAeroPanel5
+from nastran.geometry.panels import RectangularPlate, PlateArray
+from nastran.aero.cards import add_cord2rs, add_caero5s
+from pyNastran.bdf.bdf import BDF
+from pyNastran.bdf.cards.coordinate_systems import CORD2R
+from pyNastran.bdf.cards.aero.aero import CAERO5
+from nastran.post.f06.flutter import get_critical_roots, FLUTTER_INDEX_KEYS, FLUTTER_DATA_KEYS
+from nastran.aero.analysis.sweep import PanelFlutterSweep, sweep_grid
+from nastran.bdf_writer import write_bdf
+
+
+@pytest.fixture
+def sweep():
+    cfrp = OrthotropicMaterial(1, 54000., 18000., 0.3, 7200., 2.6e-9, 0.011e-6, 12.47e-6)
+    config = {
+        'vref': 1000.,
+        'ref_rho': 1.225e-12,
+        'ref_chord': 300.,
+        'n_modes': 15,
+        'frequency_limits': [.0, 1000.],
+        'method': 'PK',
+        'densities_ratio': [.5],
+        'machs': [3.0],
+        'alphas': [0., 0., 0., 0.],
+        'reduced_frequencies': [.001, .1, .2, .4],
+        'velocities': np.linspace(822, 1066, 50)*1000,
+    }
+    params = {'VREF': 1000.0, 'COUPMASS': 1, 'LMODES': 15, 'WTMASS': 1., 'GRDPNT': 1, 'OPPHIPA': 1}
+    return PanelFlutterSweep(cfrp, config, params, defaults={'nchord': 6, 'nspan': 8})
+
+
+def test_sweep_grid():
+    grid = sweep_grid(theta=[0., 45.], mach=[2., 3., 4.])
+    assert len(grid) == 6 and grid[1] == {'theta': 0., 'mach': 3.}
+
+
+def test_panel_flutter_sweep(sweep, tmp_path):
+    grid = sweep_grid(theta=[0., 30., 45.], bc=['SSSS', 'CFCF'])
+    cases = sweep.write(grid, str(tmp_path))
+    assert list(cases.theta) == [0., 0., 30., 30., 45., 45.]
+    for i in (0, 3, 4):
+        deck = io.StringIO()
+        analysis = sweep.build(grid[i])
+        write_bdf(analysis.model, deck, analysis.meshes, enddata=True)
+        with open(cases.bdf[i]) as file:
+            assert file.read() == deck.getvalue()
+
+    # the pyNastran path leaves the model and its meshes as they were
+    analysis.export_to_bdf(str(tmp_path / 'slow.bdf'), fast=False)
+    assert len(analysis.meshes) == 1 and len(analysis.model.nodes) == 0
+    model = BDF(debug=False)
+    model.read_bdf(str(tmp_path / 'slow.bdf'), xref=False)
+    assert list(model.nodes) == analysis.meshes[0].nids.tolist()
+
+    with pytest.raises(ValueError):
+        sweep.cases([{'angle': 0.}])
+
+
+def test_laminate_bending_stiffness():
+    cfrp = OrthotropicMaterial(1, 54000., 18000., 0.3, 7200., 2.6e-9)
+    D = Ply.angle_ply(1, 45., 6, 0.2, cfrp).D
+    assert np.allclose(D, D.T)
+    assert np.isclose(D[0, 0], D[1, 1]) and np.isclose(D[0, 2], D[1, 2])
+
+    D0 = Ply.angle_ply(1, 0., 6, 0.2, cfrp).D
+    assert np.isclose(D0[0, 0], cfrp.Q[0, 0] * 1.2**3 / 12) and D0[0, 2] == 0.
+
+
+def test_piston_panel_flutter():
+    a, M = 300., 3.
+    aluminum = IsotropicMaterial(1, 70000., 0.3, None, 2.7e-9)
+    plate = IsotropicPlate([0, 0, 0], [a, 0, 0], [a, a, 0], [0, a, 0], 10, 10, PSHELL(1, 1, 1.5, 1), aluminum)
+    solver = PistonPanelFlutterSolver(plate, n_modes=15)
+
+    D = plate.D[0, 0]
+    f11 = np.pi * 2 / a**2 * np.sqrt(D / plate.areal_density) / 2
+    assert np.isclose(solver.frequencies[0], f11)
+
+    rho = 1.225e-14
+    lambdas = np.linspace(100, 1500, 200)
+    df = solver.solve([M], np.sqrt(lambdas * np.sqrt(M**2 - 1) * D / (rho * a**3)), ref_rho=rho)
+    assert list(df.index.names) == ['SUBCASE', 'MACH NUMBER', 'POINT', 'INDEX'] and len(df) == 15*200
+
+    # nondimensional dynamic pressure of the flutter onset of a simply supported square plate
+    V = get_critical_roots(df).VELOCITY.iloc[0]
+    assert 490 < rho * V**2 * a**3 / (np.sqrt(M**2 - 1) * D) < 520
+
+
+def test_mode_tracking():
+    # two uncoupled modes whose frequencies cross at V = 0.5
+    def system(mach, rho, velocity):
+        K = np.zeros((len(velocity), 2, 2))
+        K[:, 0, 0] = 1. + velocity
+        K[:, 1, 1] = 2. - velocity
+        K[:, 0, 1] = K[:, 1, 0] = 1e-3
+        return K, 0.01*rho
+
+    grid = FlutterGrid([2., 3.], np.linspace(0., 1., 21) + 0.01, [1., .5])
+    sorted_roots = solve_flutter_grid(system, grid, 2, track_modes=False)
+    roots = solve_flutter_grid(system, grid, 2, chunk_size=7)
+    assert roots.shape == (2, 2, 21, 2)
+    assert np.allclose(np.sort(roots.imag, axis=-1), sorted_roots.imag)
+    # the first mode keeps getting stiffer
+    assert np.all(np.diff(roots[..., 0].imag, axis=-1) > 0)
+    assert np.all(np.diff(roots[..., 1].imag, axis=-1) < 0)
+
+
+def test_refine_flutter_onset():
+    cfrp = OrthotropicMaterial(1, 54000., 18000., 0.3, 7200., 2.6e-9)
+    plate = LaminatedStructuralPlate([0, 0, 0], [300, 0, 0], [300, 300, 0], [0, 300, 0], 4, 4,
+                                     Ply.angle_ply(1, 45., 6, 0.2, cfrp))
+    solver = PistonPanelFlutterSolver(plate, n_modes=15)
+
+    def solve(velocities):
+        return solver.solve([2., 3.], velocities, [.5], 1.225e-12, 300., 1000.)
+
+    dense = get_critical_roots(solve(np.linspace(200, 2000, 4000)*1000))
+    roots = refine_flutter_onset(solve, np.linspace(200, 2000, 10)*1000, vref=1000., rtol=1e-5)
+    assert roots.index.droplevel('POINT').equals(dense.index.droplevel('POINT'))
+    assert np.allclose(roots.VELOCITY, dense.VELOCITY, rtol=1e-4)
+    assert roots.attrs['evaluations'] < 200
+
+
+def test_refine_flutter_onset_point():
+    # the POINT of a mode depends on the solved velocities (as with mode tracking)
+    def solve(velocities):
+        point = 1 if velocities[0] < 300. else 2
+        n = len(velocities)
+        index = pd.MultiIndex.from_arrays([np.ones(n, dtype=int), np.full(n, 3.0), np.full(n, point), np.arange(n)],
+                                          names=list(FLUTTER_INDEX_KEYS))
+        df = pd.DataFrame(0., index=index, columns=list(FLUTTER_DATA_KEYS))
+        df['VELOCITY'] = velocities
+        df['DAMPING'] = velocities - 512.
+        return df
+
+    roots = refine_flutter_onset(solve, np.linspace(200, 2000, 10), rtol=1e-6)
+    assert roots.index.tolist() == [(1, 3.0, 2)]
+    assert np.isclose(roots.VELOCITY.iloc[0], 512.)
+
+
+
+def test_critical_roots_mode_in_flutter(capsys):
+    velocities = np.linspace(200., 2000., 10)
+    n = len(velocities)
+    index = pd.MultiIndex.from_arrays([np.ones(2*n, dtype=int), np.full(2*n, 3.0), np.repeat([1, 2], n), np.tile(np.arange(n), 2)],
+                                      names=list(FLUTTER_INDEX_KEYS))
+    df = pd.DataFrame(0., index=index, columns=list(FLUTTER_DATA_KEYS))
+    df['VELOCITY'] = np.tile(velocities, 2)
+    df['DAMPING'] = np.r_[velocities - 512., np.full(n, 0.1)]
+
+    roots = get_critical_roots(df)
+    assert roots.index.tolist() == [(1, 3.0, 1)]
+    assert 'POINT 2' in capsys.readouterr().out
+
+def test_superpanel5_strips():
+    p1, p2, p3, p4 = [0., 0., 0.], [90., 10., 0.], [100., 110., 5.], [5., 100., 5.]
+    superpanel = SuperAeroPanel5(1, p1, p2, p3, p4, 6, 4, theory='VANDYKE')
+    assert superpanel.strips.shape == (6, 4, 3)
+    for i, panel in superpanel.aeropanels.items():
+        assert np.allclose(panel.limit_points, superpanel.strips[i])
+        assert panel.theory == superpanel.ntheory == 1
+
+    bdf = BDF(debug=False)
+    origins, zaxes, xzplanes = superpanel.strip_coordinate_systems()
+    coords = add_cord2rs(bdf, np.arange(6) + 10, origins, zaxes, xzplanes)
+    assert list(bdf.coords) == [0] + list(range(10, 16))
+    for coord, panel in zip(coords, superpanel.aeropanels.values()):
+        origin = panel.p1 + panel.d12 / 2
+        expected = CORD2R(coord.cid, origin, origin + panel.normal, origin + panel.d12)
+        assert coord.write_card() == expected.write_card()
+        assert np.allclose([coord.i, coord.j, coord.k], [expected.i, expected.j, expected.k])
+
+    with pytest.raises(ValueError):
+        add_cord2rs(bdf, [10], origins[:1], zaxes[:1], xzplanes[:1])
+
+    # the cards get their own copies of the (read-only) strip points
+    strips = superpanel.strip_plates
+    caeros = add_caero5s(bdf, np.arange(6) + 100, 1, strips.p1, strips.chord, strips.p4, strips.chord, 4, 0, 1)
+    caeros[0].p1[0] += 1.
+    coords[0].e1[0] += 1.
+    assert caeros[0].p1[0] == strips.p1[0, 0] + 1. and np.array_equal(strips.p1[1], caeros[1].p1)
+    assert coords[0].e1[0] == origins[0, 0] + 1.
+
+
+def test_plate_geometry_cache():
+    plate = RectangularPlate([0., 0., 0.], [90., 10., 0.], [100., 110., 5.], [5., 100., 5.])
+    assert plate.geometry is plate.geometry
+    assert np.isclose(plate.chord, np.hypot(90., 10.))
+    with pytest.raises(ValueError):
+        plate.d12[0] = 1.
+
+    # cards built from the points keep them and may edit them
+    grid = BDF(debug=False).add_grid(1, plate.p1)
+    grid.xyz[0] = 1.
+    caero = CAERO5(1, 1, plate.p1, plate.chord, plate.p4, plate.chord, nspan=4)
+    caero.p1 += 1.
+    assert np.array_equal(plate.p1, [0., 0., 0.]) and np.array_equal(plate.limit_points[0], [0., 0., 0.])
+
+    plate.set_plate_limits([0., 0., 0.], [2., 0., 0.], [2., 3., 0.], [0., 3., 0.])
+    assert (plate.chord, plate.span) == (2., 3.)
+    plate.p4 = [0., 0., 3.]
+    assert np.allclose(plate.normal, [0., -1., 0.])
+
+    plates = [plate, SuperAeroPanel5(1, [0., 0., 0.], [90., 10., 0.], [100., 110., 5.], [5., 100., 5.], 6, 4)]
+    array = PlateArray.from_plates(plates)
+    assert array.points.shape == (2, 4, 3)
+    for i, p in enumerate(plates):
+        for name in ('d12', 'l12', 'd14', 'l14', 'd43', 'l43', 'd23', 'l23', 'n12', 'n14', 'normal', 'chord', 'span'):
+            assert np.allclose(getattr(array, name)[i], getattr(p, name))
+    assert np.allclose(array[1].limit_points, plates[1].limit_points)
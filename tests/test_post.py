@@ -1,7 +1,13 @@
 import pytest
+import types
+import shutil
+import numpy as np
+import pandas as pd
 
-from nastran.post.f06 import read_f06
-from nastran.post.flutter import join_flutter_pages, flutter_pages_to_df, get_critical_roots, FlutterF06Page
+from nastran.post.f06 import read_f06, iter_f06_pages, read_f06_pages, load_f06_index, F06Cache, F06Follower, read_results, parse_op2_results, read_exported, read_f06_batch
+from nastran.post.f06.common import extract_tabulated_data, extract_tabulated_array, decode_page_header
+from nastran.post.f06.pagetype import F06PageClassifier
+from nastran.post.f06.flutter import join_flutter_pages, flutter_pages_to_df, get_critical_roots, find_damping_crossings, FlutterF06Page, FlutterResults
 
 
 @pytest.fixture
@@ -34,6 +40,100 @@ def test_read_f06(flutter_f06):
     assert len(flutter_f06.pages) == 70
 
 
+def test_iter_f06_pages(flutter_f06):
+    pages = iter_f06_pages('tests/files/flutter-f06-result.txt')
+    assert isinstance(pages, types.GeneratorType)
+    assert list(map(str, pages)) == list(map(str, flutter_f06.pages))
+
+
+def test_read_f06_workers(flutter_f06):
+    res = read_f06('tests/files/flutter-f06-result.txt', workers=2)
+    assert list(map(str, res.pages)) == list(map(str, flutter_f06.pages))
+    assert all(p.df.equals(q.df) for p, q in zip(res.flutter, flutter_f06.flutter))
+
+
+def test_read_f06_cache(tmp_path, flutter_f06):
+    cache = F06Cache(str(tmp_path / 'cache'))
+    assert cache.get('tests/files/flutter-f06-result.txt') is None
+
+    read_f06('tests/files/flutter-f06-result.txt', cache=cache)
+    assert cache.get('tests/files/flutter-f06-result.txt') is not None
+
+    res = read_f06('tests/files/flutter-f06-result.txt', cache=F06Cache(str(tmp_path / 'cache')))
+    assert [type(p) for p in res.pages] == [type(p) for p in flutter_f06.nottext]
+    assert all(p.info == q.info and p.meta == q.meta and p.df.equals(q.df) for p, q in zip(res.pages, flutter_f06.nottext))
+
+    # entries of older cache versions are misses
+    with open(cache._entry_path(cache.key('tests/files/flutter-f06-result.txt')), 'wb') as file:
+        file.write(b'not an archive')
+    assert cache.get('tests/files/flutter-f06-result.txt') is None
+
+
+def test_f06_follower(tmp_path, flutter_f06):
+    with open('tests/files/flutter-f06-result.txt', 'rb') as file:
+        data = file.read()
+    filename = str(tmp_path / 'running.f06')
+
+    follower = F06Follower(filename)
+    for a, b in ((0, 1000), (1000, 150000), (150000, len(data))):
+        with open(filename, 'ab') as file:
+            file.write(data[a:b])
+        follower.poll()
+        assert follower.finished == (b == len(data))
+
+    assert list(map(str, follower.results.pages)) == list(map(str, flutter_f06.pages))
+
+
+def test_read_f06_lazy(flutter_f06):
+    with read_f06('tests/files/flutter-f06-result.txt', lazy=True) as res:
+        assert len(res.pages) == len(flutter_f06.pages)
+        assert not any(p.is_loaded for p in res.nottext)
+
+        page, expected = res.flutter[0], flutter_f06.flutter[0]
+        assert page.info == expected.info and page.meta == expected.meta
+        assert page.df.equals(expected.df) and page.is_loaded
+        assert page.raw_lines == expected.raw_lines
+        assert not page.span.source.closed
+    assert page.span.source.closed
+    assert res.flutter[1].df.equals(flutter_f06.flutter[1].df)
+    res.close()
+
+
+def test_read_f06_pages(tmp_path, flutter_f06):
+    filename = str(tmp_path / 'flutter.f06')
+    shutil.copy('tests/files/flutter-f06-result.txt', filename)
+
+    index = load_f06_index(filename)
+    assert len(index) == len(flutter_f06.pages)
+    assert load_f06_index(filename).entries == index.entries  # from the sidecar
+
+    pages = read_f06_pages(filename, ('flutter',)).pages
+    assert len(pages) == len(flutter_f06.flutter)
+    assert all(p.info == q.info and p.df.equals(q.df) for p, q in zip(pages, flutter_f06.flutter))
+
+    pages = read_f06_pages(filename, ('realeigval',)).pages
+    assert list(map(str, pages)) == list(map(str, flutter_f06.eigval))
+
+
+def test_extract_tabulated_array():
+    lines = ['  1.0  2.5E+01  -3.0\n', '  4.0  ****  6.0\n', '  7.0  8.0\n']
+    data = extract_tabulated_array(lines, 3)
+    assert data.dtype == np.float64 and data.shape == (3, 3)
+    assert np.isnan(data[1, 1]) and np.isnan(data[2, 2])
+    assert np.array_equal(data[:2], extract_tabulated_data(lines[:2]), equal_nan=True)
+
+
+def test_f06_results_lookups(flutter_f06):
+    assert flutter_f06.subcases == [1]
+    assert flutter_f06.machs == [3.0]
+    pages = flutter_f06.get_flutter(subcase=1, mach=3.0, point=2)
+    assert len(pages) == 2 and all(p.info['POINT'] == 2 for p in pages)
+    assert flutter_f06.get_flutter(point=2) == pages
+    assert len(flutter_f06.get_flutter(mach=3.0)) == 30
+    assert flutter_f06.get_flutter(subcase=2) == []
+    assert flutter_f06.get_eigval(1) == flutter_f06.eigval
+
+
 def test_flutter_results1(flutter_pages):
     assert all(map(lambda p: type(p) == FlutterF06Page, flutter_pages))
     assert len(flutter_pages) == 30
@@ -47,5 +147,102 @@ def test_flutter_results3(flutter_pages_joint, flutter_pages_df):
     assert len(flutter_pages_df) == sum(map(lambda p: len(p.df), flutter_pages_joint))
 
 
+def test_flutter_results_store(flutter_pages, flutter_pages_df):
+    store = FlutterResults(capacity=8)
+    for page in flutter_pages:
+        store.append_page(page)
+    assert len(store) == len(flutter_pages_df)
+    assert store.to_df().equals(flutter_pages_df)
+    assert FlutterResults.from_pages(flutter_pages).to_df().equals(flutter_pages_df)
+
+
 def test_flutter_results4(flutter_pages_df_critic):
     assert len(flutter_pages_df_critic) == 1
+
+
+def test_find_damping_crossings(flutter_pages_df, flutter_pages_df_critic):
+    crossings = find_damping_crossings(flutter_pages_df)
+    assert list(crossings.index.names) == ['SUBCASE', 'MACH NUMBER', 'POINT', 'CROSSING']
+    assert list(crossings.columns) == list(flutter_pages_df.columns)
+    assert (crossings.DAMPING == 0.0).all()
+    assert crossings.droplevel('CROSSING').equals(flutter_pages_df_critic)
+
+
+def test_find_damping_crossings_nan(flutter_pages_df):
+    index = pd.MultiIndex.from_tuples([(1, 3.0, point, i) for point, n in [(1, 4), (2, 3), (3, 2)] for i in range(n)],
+                                      names=flutter_pages_df.index.names)
+    df = pd.DataFrame(0., index=index, columns=flutter_pages_df.columns)
+    df['VELOCITY'] = index.get_level_values('INDEX') + 1.
+    df['DAMPING'] = [-1., np.nan, -1., -.5, -1., np.nan, 1., -1., 1.]
+
+    crossings = find_damping_crossings(df, direction=0)
+    assert crossings.index.get_level_values('POINT').tolist() == [3]
+    assert np.isclose(crossings.VELOCITY.iloc[0], 1.5)
+    assert crossings.notna().all(axis=None)
+
+
+def test_page_classifier(flutter_f06):
+    classifier = F06PageClassifier()
+    classifier.register('flutter', 3, 'FLUTTER  SUMMARY')
+    classifier.register('continued', check=lambda lines, previous: previous == 'flutter')
+    page = flutter_f06.flutter[0]
+    assert classifier.classify(page.raw_lines) == 'flutter'
+    assert classifier.classify(['1'], 'flutter') == 'continued'
+    assert classifier.classify(['1']) == 'text'
+
+    meta = decode_page_header(page.raw_lines[0])
+    assert meta == page.meta
+    assert meta['run-version-name'] == 'MSC Nastran'
+
+
+def test_op2_results(flutter_f06):
+    from pyNastran.op2.op2 import OP2
+    from pyNastran.op2.tables.lama_eigenvalues.lama_objects import RealEigenvalues
+
+    page = flutter_f06.eigval[0]
+    eigvals = RealEigenvalues('', 'LAMA', len(page.df))
+    for i, row in enumerate(page.df.to_numpy()):
+        eigvals.add_f06_line(row, i)
+    op2 = OP2(debug=False)
+    op2.eigenvalues[''] = eigvals
+    op2.matrices['EFMFACS'] = types.SimpleNamespace(data=np.full((6, len(page.df)), 0.1))
+
+    res = parse_op2_results(op2)
+    assert len(res.eigval) == 1 and len(res.modalmassfrac) == 2
+    assert not any(p.continuation for p in res.modalmassfrac)
+    assert list(res.eigval[0].df.columns) == list(page.df.columns)
+    assert np.allclose(res.eigval[0].df.CYCLES, page.df.CYCLES, rtol=1e-6)
+    assert np.allclose(res.modalmassfrac[0].df.T3SUM.iloc[-1], 0.1 * len(page.df))
+    assert len(read_results('tests/files/flutter-f06-result.txt', fmt='f06').flutter) == 30
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'hdf'])
+def test_export_results(fmt, flutter_f06, flutter_pages_df, tmp_path):
+    pytest.importorskip('pyarrow' if fmt == 'parquet' else 'tables')
+    path = str(tmp_path / 'results')
+    getattr(flutter_f06, 'to_' + fmt)(path)
+    assert read_exported(path, 'flutter', subcase=1, mach=3.0).equals(flutter_pages_df)
+    assert len(read_exported(path, 'flutter', subcase=2)) == 0
+    assert len(read_exported(path, 'eigval')) == sum(len(p.df) for p in flutter_f06.eigval)
+
+
+
+def test_export_hdf_close_machs(flutter_f06, tmp_path):
+    pytest.importorskip('tables')
+    for page in flutter_f06.flutter:
+        page.info['MACH NUMBER'] = 0.8 if page.info['POINT'] % 2 else 0.8000001
+    path = str(tmp_path / 'results.h5')
+    flutter_f06.to_hdf(path)
+    for mach, parity in ((0.8, 1), (0.8000001, 0)):
+        df = read_exported(path, 'flutter', mach=mach)
+        assert len(df) > 0 and np.all(df.index.get_level_values('POINT') % 2 == parity)
+        assert np.all(df.index.get_level_values('MACH NUMBER') == mach)
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_read_f06_batch(workers, flutter_pages_df):
+    files = ['tests/files/flutter-f06-result.txt', 'tests/files/missing.f06', 'tests/files/flutter-f06-result.txt']
+    df = read_f06_batch(files, [0.0, 15.0, 30.0], 'THETA', workers=workers)
+    assert list(df.index.names) == ['THETA'] + list(flutter_pages_df.index.names)
+    assert list(df.attrs['failures']) == ['tests/files/missing.f06']
+    assert df.loc[30.0].equals(flutter_pages_df)
+    assert len(df) == 2*len(flutter_pages_df)
@@ -0,0 +1,50 @@
+import os
+import sys
+import pytest
+
+from nastran.runner import NastranRunner, StubSolver, ExternalSolver
+
+F06_FILE = 'tests/files/flutter-f06-result.txt'
+
+
+@pytest.fixture
+def decks(tmp_path):
+    filenames = []
+    for i in range(3):
+        filename = tmp_path / 'case{:04d}.bdf'.format(i)
+        filename.write_text('SOL 145\nCEND\nBEGIN BULK\nENDDATA\n')
+        filenames.append(str(filename))
+    return filenames
+
+
+def test_stub_runner(decks, tmp_path):
+    runner = NastranRunner(StubSolver(F06_FILE), workers=2, scratch=str(tmp_path / 'scratch'))
+    for deck in decks:
+        runner.submit(deck)
+    jobs = runner.run()
+
+    assert len(jobs) == 3 and all(job.status == 'done' for job in jobs)
+    assert all(job.f06 == deck.replace('.bdf', '.f06') for job, deck in zip(runner.jobs, decks))
+    assert not (tmp_path / 'scratch' / 'case0000').exists()
+
+    roots = runner.critical_roots()
+    assert list(roots.index.get_level_values('JOB').unique()) == ['case0000', 'case0001', 'case0002']
+    assert (roots.loc['case0001'].to_numpy() == runner.jobs[0].roots.to_numpy()).all()
+
+
+def test_failed_job(decks, tmp_path):
+    runner = NastranRunner(ExternalSolver(sys.executable, ('-c', 'raise SystemExit(3)')),
+                           scratch=str(tmp_path / 'scratch'), keep_scratch=True)
+    job = runner.submit(decks[0])
+    runner.run()
+    assert job.status == 'failed' and job.returncode == 3
+    assert (tmp_path / 'scratch' / 'case0000' / 'case0000.log').exists()
+    assert len(runner.critical_roots()) == 0
+
+
+def test_temporary_scratch(decks):
+    runner = NastranRunner(StubSolver(F06_FILE))
+    job = runner.submit(decks[0])
+    runner.run()
+    assert job.status == 'done' and runner.scratch is None
+    assert not os.path.exists(os.path.dirname(job.workdir))
@@ -0,0 +1,118 @@
+import io
+import pytest
+import numpy as np
+
+from pyNastran.bdf.bdf import BDF
+
+from nastran.structures.panel import StructuralPlate
+from nastran.bdf_writer import write_bdf
+from nastran.utils import IdUtility
+
+
+@pytest.fixture
+def plate():
+    p1 = np.array([0.1, 0.2, 0.3])
+    p2 = np.array([3.3, 0.7, 0.1])
+    p3 = np.array([3.9, 2.9, 0.4])
+    p4 = np.array([0.5, 2.7, 0.2])
+    plate = StructuralPlate(p1, p2, p3, p4, 5, 3, 1, firstNid=11, firstEid=101)
+    plate.generate_mesh()
+    return plate
+
+
+def test_plate_grid(plate):
+    assert list(plate.bdf.nodes) == list(range(11, 11 + 4*6))
+    node = plate.bdf.nodes[11 + 2*6 + 4]
+    assert np.array_equal(node.xyz, plate.p1 + plate.d12*2/3 + plate.d14*4/5)
+    assert plate.bdf.nodes[11 + 4*6 - 1].xyz == pytest.approx(plate.p1 + plate.d12 + plate.d14)
+
+
+def test_plate_elements(plate):
+    assert list(plate.bdf.elements) == list(range(101, 101 + 3*5))
+    elem = plate.bdf.elements[101 + 5 + 2]
+    assert elem.node_ids == [11 + 6 + 2, 11 + 6 + 3, 11 + 12 + 3, 11 + 12 + 2]
+    assert elem.theta_mcid == 90.0
+    assert len(plate.bdf._type_to_id_map['CQUAD4']) == 15
+
+
+def test_plate_mesh(plate):
+    assert plate._bdf is None
+    assert plate.mesh.nnodes == 24 and plate.mesh.nelements == 15
+    assert np.array_equal(plate.mesh.get_xyz([11 + 2*6 + 4]), [plate.p1 + plate.d12*2/3 + plate.d14*4/5])
+
+    bulk = io.StringIO()
+    plate.write_bulk(bulk)
+    deck = io.StringIO()
+    plate.bdf.write_bdf(deck, close=False)
+    assert bulk.getvalue() == ''.join(l for l in deck.getvalue().splitlines(True) if l.startswith(('GRID', 'CQUAD4')))
+
+
+@pytest.mark.parametrize('size', [8, 16])
+def test_write_bdf(size, plate, tmp_path):
+    plate.bdf.add_grid(1001, [1e-9, 123456789.123, -0.5], cd=2)
+    plate.bdf.add_grid(1002, [1.5, 2., 3.], cp=3, comment='grid')
+    plate.bdf.add_cquad4(1001, 1, [11, 12, 18, 17], theta_mcid=7)
+    plate.bdf.add_cquad4(1002, 1, [11, 12, 18, 17], zoffset=0.1)
+    plate.bdf.add_ctria3(1003, 1, [11, 12, 18])
+    plate.bdf.write_bdf(str(tmp_path / 'a.bdf'), size=size, enddata=True)
+    write_bdf(plate.bdf, str(tmp_path / 'b.bdf'), size=size, enddata=True)
+    assert (tmp_path / 'a.bdf').read_text() == (tmp_path / 'b.bdf').read_text()
+
+
+@pytest.mark.parametrize('size', [8, 16])
+def test_write_bdf_meshes(size, plate, tmp_path):
+    model = plate.to_bdf(mesh_cards=False)
+    assert len(model.nodes) == 0 and len(model.elements) == 0
+    assert IdUtility(model, [plate.mesh]).get_next_element_id() == 116
+    write_bdf(model, str(tmp_path / 'a.bdf'), meshes=[plate.mesh], size=size, enddata=True)
+
+    text = (tmp_path / 'a.bdf').read_text()
+    assert ''.join(n.write_card(size) for n in plate.bdf.nodes.values()) in text
+    assert ''.join(e.write_card(size) for e in plate.bdf.elements.values()) in text
+
+    deck = BDF(debug=False)
+    deck.read_bdf(str(tmp_path / 'a.bdf'), xref=False)
+    assert list(deck.nodes) == list(plate.bdf.nodes) and list(deck.elements) == list(plate.bdf.elements)
+    assert all(deck.elements[eid].write_card() == e.write_card() for eid, e in plate.bdf.elements.items())
+    assert all(deck.nodes[nid].write_card() == n.write_card() for nid, n in plate.bdf.nodes.items())
+
+    with pytest.raises(ValueError):
+        write_bdf(plate.bdf, io.StringIO(), meshes=[plate.mesh])
+    with pytest.raises(ValueError):
+        write_bdf(model, io.StringIO(), meshes=[plate.mesh], is_double=True)
+
+
+def test_id_utility(plate):
+    idutil = IdUtility(plate.bdf)
+    assert idutil.get_next_element_id() == 116
+    assert idutil.get_next_coord_id() == 1
+    assert idutil.reserve_ids('element', 10) == 116
+    assert idutil.get_next_element_id() == 126
+
+    plate.bdf.add_cquad4(500, 1, [11, 12, 18, 17])  # added behind its back
+    plate.bdf.add_cquad4(200, 1, [11, 12, 18, 17])
+    assert idutil.get_last_element_id() == 500
+    del plate.bdf.elements[500]
+    assert idutil.get_last_element_id() == 200
+
+    # cards removed and others added, with a net count change of one
+    del plate.bdf.elements[101], plate.bdf.elements[102]
+    for eid in (600, 700, 7):
+        plate.bdf.add_cquad4(eid, 1, [11, 12, 18, 17])
+    assert idutil.get_last_element_id() == 700
+
+    # the last card removed and added again after a new one
+    del plate.bdf.elements[7], plate.bdf.elements[103]
+    plate.bdf.add_cquad4(800, 1, [11, 12, 18, 17])
+    plate.bdf.add_cquad4(7, 1, [11, 12, 18, 17])
+    assert idutil.get_last_element_id() == 800
+
+
+def test_id_utility_meshes(plate):
+    idutil = IdUtility(plate.to_bdf(mesh_cards=False), [plate.mesh])
+    assert (idutil.get_next_node_id(), idutil.get_next_element_id()) == (35, 116)
+    assert idutil.get_next_coord_id() == 1
+
+    # the max id of a mesh is computed once per ids array, new arrays are seen
+    plate.mesh.eids = plate.mesh.eids + 100
+    assert idutil.get_next_element_id() == 216